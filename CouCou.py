@@ -1,30 +1,116 @@
-import json
+import atexit
 import random
 import os
-import tkinter as tk
-from tkinter import messagebox, ttk
-from pathlib import Path
+import time
+from array import array
+from bisect import bisect
+from collections import deque, namedtuple
+from functools import cached_property
+
+import conjugation_cache
+import fenwick
+import spaced_repetition
+
+# tkinter, json, queue and threading are imported on first use (see import_tk,
+# the loaders and QuestionQueue below) so that `import CouCou` stays cheap for
+# headless tools.
+tk = messagebox = ttk = None
+
+def import_tk():
+    """Bind tk, messagebox and ttk at module level"""
+    global tk, messagebox, ttk
+    import tkinter as tk
+    from tkinter import messagebox, ttk
+    return tk
 
 # --- Data Loading ---
-with open("verbs-fr.json", encoding="utf-8") as f:
-    verbs_data = json.load(f)
+class ConjugationData:
+    """The quiz datasets, each read from disk on first access and then cached.
+
+    When shared_tables (default: $COUCOU_SHARED_TABLES) names a shared memory
+    block made by conjugation_cache.publish(), the verb and template tables are
+    read from it instead of the cache file.
+    """
+
+    DATASETS = ("compiled_data", "verbs_data", "conjugation_data", "top_verbs_data",
+                "not_reflexive_verbs", "all_verbs", "top_verbs_list", "top_verbs",
+                "auxiliary_forms", "form_index")
+
+    def __init__(self, verbs_path="verbs-fr.json", conjugation_path="conjugation-fr.json",
+                 cache_path="conjugation-fr.cache", top_verbs_path="top-verbs-fr.json",
+                 not_reflexive_path="not-reflexive.json", shared_tables=None):
+        self.shared_tables = shared_tables or os.environ.get("COUCOU_SHARED_TABLES")
+        self.verbs_path = verbs_path
+        self.conjugation_path = conjugation_path
+        self.cache_path = cache_path
+        self.top_verbs_path = top_verbs_path
+        self.not_reflexive_path = not_reflexive_path
+
+    @cached_property
+    def compiled_data(self):
+        # verbs-fr.json and conjugation-fr.json are served from a memory-mapped
+        # compiled cache (see conjugation_cache.py) that is rebuilt when they change.
+        if self.shared_tables:
+            return conjugation_cache.attach(self.shared_tables)
+        return conjugation_cache.load(self.verbs_path, self.conjugation_path, self.cache_path)
+
+    @cached_property
+    def verbs_data(self):
+        return self.compiled_data.verbs
+
+    @cached_property
+    def conjugation_data(self):
+        return self.compiled_data.templates
+
+    @cached_property
+    def top_verbs_data(self):
+        import json
+        with open(self.top_verbs_path, encoding="utf-8") as f:
+            return json.load(f)
 
-with open("top-verbs-fr.json", encoding="utf-8") as f:
-    top_verbs_data = json.load(f)
+    @cached_property
+    def not_reflexive_verbs(self):
+        import json
+        with open(self.not_reflexive_path, encoding="utf-8") as f:
+            return json.load(f)
 
-with open("conjugation-fr.json", encoding="utf-8") as f:
-    conjugation_data = json.load(f)
+    @cached_property
+    def all_verbs(self):
+        # Extract all valid verbs for both sets
+        return self.compiled_data.infinitives
 
-with open("not-reflexive.json", encoding="utf-8") as f:
-    not_reflexive_verbs = json.load(f)
+    @cached_property
+    def top_verbs_list(self):
+        # Handle top verbs - use the combined list from top_verbs_data
+        return self.top_verbs_data["top_verbs"] + self.top_verbs_data["dr_mrs_vandertramp"]
 
-# Extract all valid verbs for both sets
-# Extract all valid verbs for both sets
-all_verbs = list(set(list(verbs_data.keys()) + [k.replace(":", "") for k in conjugation_data if ":" in k]))
+    @cached_property
+    def top_verbs(self):
+        # Only keep verbs that exist in our full conjugation data
+        return [verb for verb in self.top_verbs_list if verb in self.all_verbs]
 
-# Handle top verbs - use the combined list from top_verbs_data
-top_verbs_list = top_verbs_data["top_verbs"] + top_verbs_data["dr_mrs_vandertramp"]
-top_verbs = [verb for verb in top_verbs_list if verb in all_verbs]  # Only keep verbs that exist in our full conjugation data
+    @cached_property
+    def auxiliary_forms(self):
+        # (aux, mood, tense, subject) -> form or None, filled in by the batched API
+        return {}
+
+    @cached_property
+    def form_index(self):
+        return FormIndex(self.compiled_data, self.conjugation_data)
+
+    def reload(self):
+        """Drop every cached dataset so the next access reads the files again"""
+        for name in self.DATASETS:
+            self.__dict__.pop(name, None)
+        clear_memos()
+
+data = ConjugationData()
+
+def __getattr__(name):
+    """Keep the old module-level dataset names working, loading on first use"""
+    if name in ConjugationData.DATASETS:
+        return getattr(data, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Original Variables ---      
 
@@ -83,26 +169,25 @@ for mood, tenses in mood_tense_map.items():
     for tense in tenses:
         all_mood_tense_pairs.append((mood, tense))
 
-##Weighted tenses:
-# Example: Give compound tenses double weight
-#all_mood_tense_pairs = []
-#for mood, tenses in mood_tense_map.items():
-#    for tense in tenses:
-#        weight = 2 if tense in compound_tenses.get(mood, {}) else 1
-#        weighted_mood_tense_pairs.extend([(mood, tense)] * weight)
-
-# Extract all valid verbs
-all_verbs = list(set(list(verbs_data.keys()) + [k.replace(":", "") for k in conjugation_data if ":" in k]))
+# Relative weight of each (mood, tense) pair when drawing questions, per verb
+# set. Unlisted pairs weigh 1 and a weight of 0 disables the pair. Example:
+# give compound tenses double weight in the full verb set with
+#   question_weights["all_verbs"] = {(mood, tense): 2 for mood, tenses in compound_tenses.items() for tense in tenses}
+question_weights = {
+    "all_verbs": {},
+    "top_verbs": {},
+}
 
 # --- Original Functions ---
 def find_group(verb):
-    for key in conjugation_data:
-        if ":" not in key:
-            continue
-        prefix, root = key.split(":")
-        if verb == prefix + root:
-            return key
-    return None
+    return data.compiled_data.find_group(verb)
+
+def resolve_template(verb):
+    """Return the (template, prefix) pair used to conjugate verb"""
+    resolved = data.compiled_data.resolve(verb) if isinstance(verb, str) else None
+    if resolved is None:
+        raise ValueError(f"No group for {verb}")
+    return resolved
 
 def get_json_index(mood, subject):
     if mood == "imperative":
@@ -126,21 +211,12 @@ def get_gender_number_index(subject):
 def get_auxiliary(verb, is_reflexive):
     if is_reflexive:
         return "être"
-    if verb in verbs_data:
-        return verbs_data[verb].get("aux", "avoir")
-    return "avoir"
+    entry = data.verbs_data.get(verb)
+    return "avoir" if entry is None else entry.get("aux", "avoir")
 
 def get_participle(verb, subject, is_reflexive):
-    if verb in verbs_data:
-        template = verbs_data[verb]["t"]
-        prefix = verb[:-len(template.split(":")[1])]
-    else:
-        template = find_group(verb)
-        if not template:
-            raise ValueError(f"No group found for {verb}")
-        prefix = template.split(":")[0]
-
-    forms = conjugation_data[template]["participle"]["past-participle"]
+    template, prefix = resolve_template(verb)
+    forms = data.conjugation_data[template]["participle"]["past-participle"]
     if not isinstance(forms, list):
         raise ValueError(f"Expected list for past-participle of {verb}")
     if is_reflexive or get_auxiliary(verb, is_reflexive) == "être":
@@ -150,16 +226,8 @@ def get_participle(verb, subject, is_reflexive):
     return prefix + forms[index]["i"]
 
 def conjugate_simple(verb, mood, tense, subject):
-    if verb in verbs_data:
-        template = verbs_data[verb]["t"]
-        prefix = verb[:-len(template.split(":")[1])]
-    else:
-        template = find_group(verb)
-        if not template:
-            raise ValueError(f"No group for {verb}")
-        prefix = template.split(":")[0]
-
-    forms = conjugation_data[template][mood][tense]
+    template, prefix = resolve_template(verb)
+    forms = data.conjugation_data[template][mood][tense]
     index = get_json_index(mood, subject)
     form = forms[index]["i"]
     if isinstance(form, list):
@@ -170,7 +238,7 @@ def conjugate_compound(verb, mood, tense, subject, is_reflexive):
     aux_verb = get_auxiliary(verb, is_reflexive)
     aux_mood = mood
     aux_tense = compound_tenses[mood][tense]
-    aux_form = conjugate_simple(aux_verb, aux_mood, aux_tense, subject)
+    aux_form = conjugate_auxiliary(aux_verb, aux_mood, aux_tense, subject)
     participle = get_participle(verb, subject, is_reflexive)
     if is_reflexive:
         reflexive = reflexive_pronouns[subject]
@@ -178,12 +246,796 @@ def conjugate_compound(verb, mood, tense, subject, is_reflexive):
     else:
         return f"{aux_form} {participle}"
 
+# --- Questions ---
+def pick_question(verb_set):
+    """Draw (verb, mood, tense, subject, is_reflexive) for a new question"""
+    verb = random.choice(verb_set)
+
+    # This ensures equal probability for each tense across all moods
+    mood, tense = random.choice(all_mood_tense_pairs)
+    subject = random.choice(imperative_subjects if mood == "imperative" else all_subjects)
+    is_reflexive = (verb not in data.not_reflexive_verbs and mood != "imperative" and random.random() < 0.15)
+    return verb, mood, tense, subject, is_reflexive
+
+def expected_answer(verb, mood, tense, subject, is_reflexive):
+    """The answer the quiz expects; raises if the combination cannot be conjugated"""
+    if tense in compound_tenses.get(mood, {}):
+        return conjugate_compound(verb, mood, tense, subject, is_reflexive)
+    answer = conjugate_simple(verb, mood, tense, subject)
+    if is_reflexive:
+        pronoun = reflexive_pronouns[subject]
+        answer = f"{pronoun} {answer}"
+    return answer
+
+# --- Memoisation ---
+class LRUMemo:
+    """A bounded least-recently-used cache of func's results, by positional arguments.
+
+    Calls that raise are not cached. Safe to share with the question producer
+    thread; the counters may then be off by a few.
+    """
+    def __init__(self, func, maxsize):
+        from collections import OrderedDict
+        self.func = func
+        self.maxsize = maxsize
+        self.cache = OrderedDict()  # args -> result, least recent first
+        self.hits = self.misses = self.evictions = 0
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    MISSING = object()
+
+    def __call__(self, *args):
+        cache = self.cache
+        value = cache.get(args, self.MISSING)
+        if value is self.MISSING:
+            self.misses += 1
+            value = self.func(*args)
+            if self.maxsize:
+                cache[args] = value
+                if len(cache) > self.maxsize:
+                    self.evict(len(cache) - self.maxsize)
+            return value
+        self.hits += 1
+        try:
+            cache.move_to_end(args)
+        except KeyError:
+            pass  # evicted by the other thread in the meantime
+        return value
+
+    def evict(self, count):
+        for _ in range(count):
+            try:
+                self.cache.popitem(last=False)
+            except KeyError:
+                return
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        """Change the bound (0 turns caching off), evicting the oldest results if needed"""
+        self.maxsize = maxsize
+        self.evict(len(self.cache) - maxsize)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        calls = self.hits + self.misses
+        return {"size": len(self.cache), "maxsize": self.maxsize, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / calls if calls else 0.0}
+
+# Every question goes through expected_answer, and compound ones share the
+# same couple of hundred auxiliary forms of avoir/être. conjugate_simple and
+# get_participle themselves are left alone: over all verbs they would hardly
+# ever hit, and they are called in bulk by tools that walk every verb.
+conjugate_auxiliary = LRUMemo(conjugate_simple, 1024)
+expected_answer = LRUMemo(expected_answer, 16384)
+MEMOS = {"expected_answer": expected_answer, "conjugate_auxiliary": conjugate_auxiliary}
+
+def memo_stats():
+    return {name: memo.stats() for name, memo in MEMOS.items()}
+
+def clear_memos():
+    """Forget every memoised result (data.reload() does this)"""
+    for memo in MEMOS.values():
+        memo.clear()
+
+Question = namedtuple("Question", "verb mood tense subject is_reflexive answer")
+
+def question_prompt(verb, mood, tense, subject, is_reflexive):
+    """The instruction shown for a question, in French"""
+    return (f"Conjuguez '{verb}'{' (réflexif)' if is_reflexive else ''} au "
+            f"{french_mood_labels.get(mood, mood)} - {french_tense_labels.get(tense, tense)}, "
+            f"sujet : '{subject}'")
+
+def make_question(verb_set, attempts=1000):
+    """Draw questions until one can be conjugated; bad draws are discarded"""
+    for _ in range(attempts):
+        verb, mood, tense, subject, is_reflexive = pick_question(verb_set)
+        try:
+            answer = expected_answer(verb, mood, tense, subject, is_reflexive)
+        except Exception as e:
+            print(f"Skipping question due to error: {e}")
+            continue
+        return Question(verb, mood, tense, subject, is_reflexive, answer)
+    raise RuntimeError(f"No question could be generated in {attempts} attempts")
+
+# Subjects whose bit is set in a 9-bit mask over all_subjects
+MASK_SUBJECTS = [
+    tuple(subject for bit, subject in enumerate(all_subjects) if mask >> bit & 1)
+    for mask in range(1 << len(all_subjects))
+]
+
+class QuestionSpace:
+    """Every valid (verb, mood, tense, subject, reflexive) question of a verb set.
+
+    Validity only depends on a verb's template and auxiliary, so subject masks
+    are computed once per (template, auxiliary) signature and shared. Drawing
+    picks a pair by cumulative weight (bisect), then a verb uniformly among the
+    verbs valid for it, then a subject from its mask: no draw is rejected.
+    """
+
+    def __init__(self, verb_set, weights=None, history=5, reflexive_rate=0.15):
+        self.verb_set = verb_set
+        self.pairs = list(all_mood_tense_pairs)
+        self.reflexive_rate = reflexive_rate
+        self.recent = deque(maxlen=history)  # ring buffer of recently drawn verbs
+
+        signature_ids = {}
+        self.masks = []  # signature -> [(plain_mask, reflexive_mask) per pair]
+        self.signatures = array("H")  # verb_set position -> signature
+        self.positions = [array("I") for _ in self.pairs]  # pair -> valid verb_set positions
+
+        for position, verb in enumerate(verb_set):
+            try:
+                template, _ = resolve_template(verb)
+                aux_verb = get_auxiliary(verb, False)
+            except ValueError:
+                self.signatures.append(0xFFFF)
+                continue
+            key = (template, aux_verb if isinstance(aux_verb, str) else tuple(aux_verb))
+            signature = signature_ids.get(key)
+            if signature is None:
+                signature = signature_ids[key] = len(self.masks)
+                self.masks.append(self.subject_masks(verb))
+            self.signatures.append(signature)
+
+            allow_reflexive = verb not in data.not_reflexive_verbs
+            for index, (plain, reflexive) in enumerate(self.masks[signature]):
+                if plain or (reflexive and allow_reflexive):
+                    self.positions[index].append(position)
+
+        self.set_weights(weights)
+
+    def subject_masks(self, verb):
+        masks = {pair: [0, 0] for pair in self.pairs}
+        for mood, tense, subject, form, reflexive_form in paradigm_rows(verb, self.pairs):
+            bit = 1 << all_subjects.index(subject)
+            if form is not None:
+                masks[mood, tense][0] |= bit
+            if reflexive_form is not None:
+                masks[mood, tense][1] |= bit
+        return [tuple(masks[pair]) for pair in self.pairs]
+
+    def set_weights(self, weights=None):
+        self.weights = dict(weights or {})
+        self.cumulative = []
+        total = 0
+        for pair, positions in zip(self.pairs, self.positions):
+            if positions:
+                total += self.weights.get(pair, 1)
+            self.cumulative.append(total)
+        if not total:
+            raise ValueError("No valid questions for this verb set and weights")
+
+    def __len__(self):
+        """Number of valid (verb, mood, tense) combinations"""
+        return sum(len(positions) for positions in self.positions)
+
+    def draw(self, rng=random):
+        """Return (verb, mood, tense, subject, is_reflexive) for a valid question"""
+        return next(self.draws(1, rng))
+
+    def draws(self, count, rng=random):
+        """Yield count draws; the same as calling draw() count times, only faster"""
+        cumulative, positions_of, verb_set, recent = self.cumulative, self.positions, self.verb_set, self.recent
+        pairs, masks, signatures, reflexive_rate = self.pairs, self.masks, self.signatures, self.reflexive_rate
+        not_reflexive = data.not_reflexive_verbs
+        scale = cumulative[-1]
+        uniform = rng.random
+        for _ in range(count):
+            for _ in range(3):
+                index = bisect(cumulative, uniform() * scale)
+                positions = positions_of[index]
+                position = positions[int(uniform() * len(positions))]
+                verb = verb_set[position]
+                if verb not in recent:
+                    break
+            recent.append(verb)
+
+            # question_at(), inlined
+            mood, tense = pairs[index]
+            plain, reflexive = masks[signatures[position]][index]
+            if reflexive and verb not in not_reflexive:
+                is_reflexive = not plain or uniform() < reflexive_rate
+            else:
+                is_reflexive = False
+            subjects = MASK_SUBJECTS[reflexive if is_reflexive else plain]
+            yield verb, mood, tense, subjects[int(uniform() * len(subjects))], is_reflexive
+
+    def question_at(self, position, index, rng=random):
+        """Complete the verb at position and pair index with a subject and reflexive flag"""
+        verb = self.verb_set[position]
+        mood, tense = self.pairs[index]
+        plain, reflexive = self.masks[self.signatures[position]][index]
+        if reflexive and verb not in data.not_reflexive_verbs:
+            is_reflexive = not plain or rng.random() < self.reflexive_rate
+        else:
+            is_reflexive = False
+        subjects = MASK_SUBJECTS[reflexive if is_reflexive else plain]
+        return verb, mood, tense, subjects[int(rng.random() * len(subjects))], is_reflexive
+
+    def make_question(self, rng=random):
+        verb, mood, tense, subject, is_reflexive = self.draw(rng)
+        answer = expected_answer(verb, mood, tense, subject, is_reflexive)
+        return Question(verb, mood, tense, subject, is_reflexive, answer)
+
+class AdaptiveSampler:
+    """Draws from a QuestionSpace with each verb weighted by its recent error rate.
+
+    Every verb and every (mood, tense) pair keeps a moving average of its
+    error rate, and weighs FLOOR plus that average, so a verb that keeps
+    being missed comes up about twenty times as often as a mastered one.
+    Verb weights live in a Fenwick tree, making both a draw and the update
+    after an answer O(log n); the pair is then picked among the verb's valid
+    pairs, which are few enough to scan.
+    """
+    PRIOR = 0.3  # error rate assumed before a verb or pair is answered
+    RATE = 0.3   # weight of the latest answer in the moving average
+    FLOOR = 0.05
+
+    def __init__(self, space, weigh_pairs=True, history=5):
+        self.space = space
+        self.weigh_pairs = weigh_pairs
+        self.recent = deque(maxlen=history)
+        self.position = {verb: position for position, verb in enumerate(space.verb_set)}
+        self.pair_index = {pair: index for index, pair in enumerate(space.pairs)}
+        self.errors = array("d", [self.PRIOR]) * len(space.verb_set)
+        self.pair_errors = array("d", [self.PRIOR]) * len(space.pairs)
+
+        askable = bytearray(len(space.verb_set))
+        for positions in space.positions:
+            for position in positions:
+                askable[position] = 1
+        self.tree = fenwick.FenwickTree([self.FLOOR + self.PRIOR if ok else 0.0 for ok in askable])
+        if not self.tree.total():
+            raise ValueError("No valid questions for this verb set")
+
+    def record(self, question, correct):
+        """Fold an answer into the verb's and the pair's error rates"""
+        self.record_ids(self.position.get(question.verb),
+                        self.pair_index.get((question.mood, question.tense)), correct)
+
+    def record_ids(self, position, index, correct):
+        miss = 0.0 if correct else self.RATE
+        if position is not None:
+            error = self.errors[position] = self.errors[position] * (1 - self.RATE) + miss
+            if self.tree.weights[position]:
+                self.tree.set(position, self.FLOOR + error)
+        if index is not None:
+            self.pair_errors[index] = self.pair_errors[index] * (1 - self.RATE) + miss
+
+    def replay(self, answer_log, last=1000):
+        """Start from the error rates of the last answers in an AnswerLog"""
+        history = answer_log.history
+        for row in range(max(0, len(history) - last), len(history)):
+            _, verb, pair, _, _, correct, _ = history.row(row)
+            self.record_ids(self.position.get(data.all_verbs[verb]),
+                            self.pair_index.get(answer_log.pairs[pair]), correct)
+
+    def draw(self, rng=random):
+        """Return (verb, mood, tense, subject, is_reflexive) for a valid question"""
+        space = self.space
+        for _ in range(3):
+            position = self.tree.sample(rng)
+            verb = space.verb_set[position]
+            if verb not in self.recent:
+                break
+        self.recent.append(verb)
+
+        allow_reflexive = verb not in data.not_reflexive_verbs
+        indexes = []
+        cumulative = []
+        total = 0.0
+        for index, (plain, reflexive) in enumerate(space.masks[space.signatures[position]]):
+            if plain or (reflexive and allow_reflexive):
+                weight = space.weights.get(space.pairs[index], 1)
+                if self.weigh_pairs:
+                    weight *= self.FLOOR + self.pair_errors[index]
+                total += weight
+                indexes.append(index)
+                cumulative.append(total)
+        if total:
+            index = indexes[min(bisect(cumulative, rng.random() * total), len(indexes) - 1)]
+        else:
+            index = indexes[int(rng.random() * len(indexes))]
+        return space.question_at(position, index, rng)
+
+    def make_question(self, rng=random):
+        verb, mood, tense, subject, is_reflexive = self.draw(rng)
+        answer = expected_answer(verb, mood, tense, subject, is_reflexive)
+        return Question(verb, mood, tense, subject, is_reflexive, answer)
+
+class QuestionQueue:
+    """A bounded queue of ready questions, kept full by a background thread"""
+
+    def __init__(self, verb_set, size=8, weights=None):
+        import queue
+        import threading
+        self.verb_set = verb_set
+        self.weights = weights
+        self.spaces = {}  # id(verb set) -> (verb set, QuestionSpace); holding the set keeps its id unique
+        self.lock = threading.Lock()  # held while a space is built, so each is built once
+        self.generation = 0  # bumped when the verb set changes; older questions are dropped
+        self.queue = queue.Queue(maxsize=size)
+        self.worker = threading.Thread(target=self.fill, name="question-producer", daemon=True)
+        self.worker.start()
+
+    def space_for(self, verb_set, weights):
+        """verb_set's QuestionSpace, built on first use; building takes a while"""
+        with self.lock:
+            entry = self.spaces.get(id(verb_set))
+            if entry is None:
+                entry = self.spaces[id(verb_set)] = (verb_set, QuestionSpace(verb_set, weights))
+            space = entry[1]
+            if space.weights != (weights or {}):
+                space.set_weights(weights)
+        return space
+
+    def built_space(self, verb_set):
+        """verb_set's QuestionSpace if it has been built, else None; never waits for a build"""
+        entry = self.spaces.get(id(verb_set))
+        return entry and entry[1]
+
+    def fill(self):
+        failures = 0
+        while True:
+            generation, verb_set, weights = self.generation, self.verb_set, self.weights
+            try:
+                question = self.space_for(verb_set, weights).make_question()
+            except Exception as e:
+                # Skip the bad draw, as make_question does, and slow down if every draw fails
+                failures += 1
+                print(f"Question producer skipped a question: {e}")
+                time.sleep(min(0.01 * failures, 1.0))
+                continue
+            failures = 0
+            self.queue.put((generation, question))
+
+    def next_question(self):
+        """Pop a ready question, or build one synchronously if none is queued"""
+        import queue
+        while True:
+            try:
+                generation, question = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation:
+                return question
+        # The producer's weighted draw once its space exists; building one here would
+        # stall the UI, so until then make_question's cheap uniform draw stands in
+        space = self.built_space(self.verb_set)
+        if space is not None:
+            try:
+                return space.make_question()
+            except Exception:
+                pass  # make_question retries draws that fail
+        return make_question(self.verb_set)
+
+    def set_verb_set(self, verb_set, weights=None):
+        self.verb_set = verb_set
+        self.weights = weights
+        self.generation += 1
+
+class ReviewQueue:
+    """Spaced-repetition mode over every all_verbs x (mood, tense) x subject item.
+
+    Items that are due come first; otherwise a fresh question is asked and
+    becomes a scheduled item once answered.
+    """
+
+    def __init__(self, path="review-state.bin"):
+        self.pairs = list(all_mood_tense_pairs)
+        self.pair_index = {pair: i for i, pair in enumerate(self.pairs)}
+        size = len(data.all_verbs) * len(self.pairs) * len(all_subjects)
+        self.scheduler = spaced_repetition.LeitnerScheduler(size, path, data.compiled_data.digest)
+
+    def item_for(self, question):
+        verb_index = data.all_verbs.index(question.verb)
+        pair = self.pair_index[question.mood, question.tense]
+        return (verb_index * len(self.pairs) + pair) * len(all_subjects) + all_subjects.index(question.subject)
+
+    def question_for(self, item):
+        rest, subject = divmod(item, len(all_subjects))
+        verb_index, pair = divmod(rest, len(self.pairs))
+        verb = data.all_verbs[verb_index]
+        mood, tense = self.pairs[pair]
+        subject = all_subjects[subject]
+        # Items do not track the reflexive flag: ask the plain form when it exists
+        for is_reflexive in (False, True):
+            try:
+                answer = expected_answer(verb, mood, tense, subject, is_reflexive)
+            except Exception:
+                continue
+            return Question(verb, mood, tense, subject, is_reflexive, answer)
+        return None
+
+    def next_question(self, fresh):
+        """Return the most overdue question, or fresh() when nothing is due"""
+        while True:
+            item = self.scheduler.next_due()
+            if item is None:
+                return fresh()
+            question = self.question_for(item)
+            if question is not None:
+                return question
+            self.scheduler.discard(item)
+
+    def record(self, question, correct):
+        self.scheduler.record(self.item_for(question), correct)
+
+class AnswerLog:
+    """Every answer given, in answer_history's columnar log, by all_verbs position.
+
+    Accuracy is also kept per template, numbered in conjugation_data order.
+    """
+
+    def __init__(self, path="answer-history.bin"):
+        import answer_history
+        self.pairs = list(all_mood_tense_pairs)
+        self.pair_index = {pair: i for i, pair in enumerate(self.pairs)}
+        self.templates = list(data.conjugation_data)
+        self.history = answer_history.AnswerHistory(
+            len(data.all_verbs), len(self.pairs),
+            groups=data.compiled_data.infinitive_templates(), group_count=len(self.templates),
+            path=path, digest=data.compiled_data.digest,
+        )
+
+    def record(self, question, correct, response_time, when=None):
+        self.history.record(
+            data.all_verbs.index(question.verb),
+            self.pair_index[question.mood, question.tense],
+            all_subjects.index(question.subject),
+            question.is_reflexive, correct, response_time,
+            time.time() if when is None else when,
+        )
+
+    def summary(self, now=None, weakest=5):
+        """Overall, recent and per-tense accuracy, plus the weakest verbs and templates"""
+        history = self.history
+        now = time.time() if now is None else now
+        pairs = history.pair_accuracy()
+        templates = [
+            (template, answered, history.group_correct[group])
+            for group, (template, answered) in enumerate(zip(self.templates, history.group_answered))
+            if answered >= 3
+        ]
+        templates.sort(key=lambda item: item[2] / item[1])
+        return {
+            "answered": len(history),
+            "accuracy": history.accuracy(),
+            "last_20": history.accuracy(last=20),
+            "last_100": history.accuracy(last=100),
+            "last_day": history.accuracy(since=now - 86400),
+            "by_tense": {
+                f"{mood} {tense}": correct / answered
+                for (mood, tense), (answered, correct) in ((self.pairs[p], counts) for p, counts in pairs.items())
+            },
+            "weakest_verbs": [data.all_verbs[verb] for verb in history.weakest_verbs(weakest)],
+            "weakest_templates": [template for template, _, _ in templates[:weakest]],
+        }
+
+    def close(self):
+        self.history.close()
+
+# --- Batched Conjugation ---
+def select_form(forms, index):
+    """Return the form conjugate_simple would pick from forms[index], or None"""
+    try:
+        form = forms[index]["i"]
+        if isinstance(form, list):
+            form = form[0]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return form if isinstance(form, str) else None
+
+def select_participle(forms, index, prefix):
+    try:
+        form = forms[index]["i"]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return prefix + form if isinstance(form, str) else None
+
+def auxiliary_form(aux_verb, mood, tense, subject):
+    key = (aux_verb, mood, tense, subject)
+    cache = data.auxiliary_forms
+    if key not in cache:
+        try:
+            cache[key] = conjugate_simple(aux_verb, mood, tense, subject)
+        except Exception:
+            cache[key] = None
+    return cache[key]
+
+def select_mood_tense_pairs(moods=None, tenses=None):
+    return [
+        (mood, tense) for mood, tense in all_mood_tense_pairs
+        if (moods is None or mood in moods) and (tenses is None or tense in tenses)
+    ]
+
+def resolve_verb(verb):
+    """Return (moods, prefix, aux_verb, participles), all paradigm_rows needs to know of verb"""
+    template, prefix = resolve_template(verb)
+    moods = data.conjugation_data[template]
+    aux_verb = get_auxiliary(verb, False)
+    if not isinstance(aux_verb, str):
+        aux_verb = None
+
+    participles = moods.get("participle", {}).get("past-participle")
+    if isinstance(participles, list):
+        participles = [select_participle(participles, i, prefix) for i in range(4)]
+    else:
+        participles = [None] * 4
+    return moods, prefix, aux_verb, participles
+
+def paradigm_form(resolved, mood, tense, subject):
+    """Return (form, reflexive_form) as paradigm_rows gives them, for one question"""
+    moods, prefix, aux_verb, participles = resolved
+    aux_tense = compound_tenses.get(mood, {}).get(tense)
+    if aux_tense is None:
+        form = select_form(moods.get(mood, {}).get(tense), get_json_index(mood, subject))
+        if form is None:
+            return None, None
+        form = prefix + form
+        return form, None if mood == "imperative" else f"{reflexive_pronouns[subject]} {form}"
+
+    gender = get_gender_number_index(subject)
+    form = reflexive_form = None
+    if aux_verb is not None:
+        aux_form = auxiliary_form(aux_verb, mood, aux_tense, subject)
+        participle = participles[gender if aux_verb == "être" else 0]
+        if aux_form is not None and participle is not None:
+            form = f"{aux_form} {participle}"
+    aux_form = auxiliary_form("être", mood, aux_tense, subject)
+    if aux_form is not None and participles[gender] is not None:
+        reflexive_form = f"{reflexive_pronouns[subject]} {aux_form} {participles[gender]}"
+    return form, reflexive_form
+
+def paradigm_rows(verb, pairs=all_mood_tense_pairs, resolved=None):
+    """Yield (mood, tense, subject, form, reflexive_form) for every pair and subject.
+
+    The template, prefix, auxiliary and participles are resolved once per verb,
+    or taken from resolved (what resolve_verb returned for verb).
+    Forms that conjugate_simple/conjugate_compound would reject are None, as is
+    every reflexive imperative (the quiz never asks for those).
+    """
+    moods, prefix, aux_verb, participles = resolved or resolve_verb(verb)
+
+    for mood, tense in pairs:
+        subjects = imperative_subjects if mood == "imperative" else all_subjects
+        aux_tense = compound_tenses.get(mood, {}).get(tense)
+        if aux_tense is None:
+            forms = moods.get(mood, {}).get(tense)
+            for subject in subjects:
+                form = select_form(forms, get_json_index(mood, subject))
+                if form is not None:
+                    form = prefix + form
+                reflexive_form = None
+                if form is not None and mood != "imperative":
+                    reflexive_form = f"{reflexive_pronouns[subject]} {form}"
+                yield mood, tense, subject, form, reflexive_form
+            continue
+
+        for subject in subjects:
+            gender = get_gender_number_index(subject)
+            form = None
+            if aux_verb is not None:
+                aux_form = auxiliary_form(aux_verb, mood, aux_tense, subject)
+                participle = participles[gender if aux_verb == "être" else 0]
+                if aux_form is not None and participle is not None:
+                    form = f"{aux_form} {participle}"
+            reflexive_form = None
+            aux_form = auxiliary_form("être", mood, aux_tense, subject)
+            if aux_form is not None and participles[gender] is not None:
+                reflexive_form = f"{reflexive_pronouns[subject]} {aux_form} {participles[gender]}"
+            yield mood, tense, subject, form, reflexive_form
+
+def conjugate_paradigm(verb, moods=None, tenses=None):
+    """Conjugate verb in every mood/tense/subject at once.
+
+    Returns {(mood, tense): {subject: (form, reflexive_form)}}; see paradigm_rows.
+    """
+    paradigm = {}
+    for mood, tense, subject, form, reflexive_form in paradigm_rows(
+            verb, select_mood_tense_pairs(moods, tenses)):
+        paradigm.setdefault((mood, tense), {})[subject] = (form, reflexive_form)
+    return paradigm
+
+def conjugate_many(verbs, moods=None, tenses=None):
+    """Yield (verb, mood, tense, subject, is_reflexive, form) for every valid form.
+
+    Verbs that cannot be resolved to a template are skipped.
+    """
+    pairs = select_mood_tense_pairs(moods, tenses)
+    for verb in verbs:
+        try:
+            rows = list(paradigm_rows(verb, pairs))
+        except Exception as e:
+            print(f"Skipping {verb}: {e}")
+            continue
+        for mood, tense, subject, form, reflexive_form in rows:
+            if form is not None:
+                yield verb, mood, tense, subject, False, form
+            if reflexive_form is not None:
+                yield verb, mood, tense, subject, True, reflexive_form
+
+# --- Reverse Lookup ---
+FormMatch = namedtuple("FormMatch", "verb mood tense subject is_reflexive")
+
+class FormIndex:
+    """Reverse index from a conjugated form to every question it answers.
+
+    Rather than storing millions of full forms, it indexes the endings of each
+    template, the participle endings, the auxiliary forms and the stem each
+    verb is conjugated from (a few thousand keys each). A lookup tries every
+    split of the form into stem + ending and keeps the verbs whose template
+    has that ending. The accepted forms are exactly those paradigm_rows
+    produces.
+    """
+    def __init__(self, compiled=None, templates=None):
+        compiled = compiled or data.compiled_data
+        templates = templates or data.conjugation_data
+        self.stems = {}        # stem -> {template: verb}
+        self.endings = {}      # ending -> {template: [(mood, tense, json index)]}
+        self.participles = {}  # participle ending -> {template: [gender/number index]}
+        self.auxiliaries = {}  # auxiliary form -> [(aux verb, mood, compound tense, subject)]
+
+        for verb in compiled.infinitives:
+            template, stem = compiled.resolve(verb)
+            self.stems.setdefault(stem, {})[template] = verb
+
+        simple_pairs = [pair for pair in all_mood_tense_pairs
+                        if pair[1] not in compound_tenses.get(pair[0], {})]
+        for template in templates:
+            moods = templates[template]
+            for mood, tense in simple_pairs:
+                forms = moods.get(mood, {}).get(tense)
+                for index in range(len(imperative_subjects if mood == "imperative" else subject_order)):
+                    ending = select_form(forms, index)
+                    if ending is not None:
+                        self.endings.setdefault(ending, {}).setdefault(template, []).append((mood, tense, index))
+            participles = moods.get("participle", {}).get("past-participle")
+            if isinstance(participles, list):
+                for index in range(4):
+                    ending = select_participle(participles, index, "")
+                    if ending is not None:
+                        self.participles.setdefault(ending, {}).setdefault(template, []).append(index)
+
+        for aux_verb in ("avoir", "être"):
+            for mood, tenses in compound_tenses.items():
+                for tense, aux_tense in tenses.items():
+                    for subject in all_subjects:
+                        form = auxiliary_form(aux_verb, mood, aux_tense, subject)
+                        if form is not None:
+                            self.auxiliaries.setdefault(form, []).append((aux_verb, mood, tense, subject))
+
+        self.longest_ending = max(map(len, self.endings), default=0)
+        self.longest_participle = max(map(len, self.participles), default=0)
+
+    def splits(self, text, table, longest):
+        """Yield (verb, entries) for every split of text into a verb's stem and an ending in table"""
+        for i in range(max(0, len(text) - longest), len(text) + 1):
+            templates = table.get(text[i:])
+            if not templates:
+                continue
+            verbs = self.stems.get(text[:i])
+            if not verbs:
+                continue
+            for template, verb in verbs.items():
+                entries = templates.get(template)
+                if entries:
+                    yield verb, entries
+
+    def lookup(self, form):
+        """Return the FormMatch of every question whose answer is form"""
+        matches = []
+        self.match(form, None, matches)
+        pronoun, _, rest = form.partition(" ")
+        if rest and pronoun in REFLEXIVE_SUBJECTS:
+            self.match(rest, pronoun, matches)
+        return matches
+
+    def match(self, text, pronoun, matches):
+        is_reflexive = pronoun is not None
+        for verb, entries in self.splits(text, self.endings, self.longest_ending):
+            for mood, tense, index in entries:
+                if mood == "imperative":
+                    if not is_reflexive:
+                        matches.append(FormMatch(verb, mood, tense, imperative_subjects[index], False))
+                    continue
+                for subject in INDEX_SUBJECTS[index]:
+                    if not is_reflexive or reflexive_pronouns[subject] == pronoun:
+                        matches.append(FormMatch(verb, mood, tense, subject, is_reflexive))
+
+        aux_form, _, participle = text.partition(" ")
+        auxiliaries = self.auxiliaries.get(aux_form)
+        if not auxiliaries:
+            return
+        participles = [
+            (verb, indexes, get_auxiliary(verb, False))
+            for verb, indexes in self.splits(participle, self.participles, self.longest_participle)
+        ]
+        if not participles:
+            return
+        for aux_verb, mood, tense, subject in auxiliaries:
+            if is_reflexive and (aux_verb != "être" or reflexive_pronouns[subject] != pronoun):
+                continue
+            gender = get_gender_number_index(subject)
+            for verb, indexes, verb_aux in participles:
+                if is_reflexive:
+                    if gender in indexes:
+                        matches.append(FormMatch(verb, mood, tense, subject, True))
+                elif verb_aux == aux_verb and (gender if aux_verb == "être" else 0) in indexes:
+                    matches.append(FormMatch(verb, mood, tense, subject, False))
+
+REFLEXIVE_SUBJECTS = set(reflexive_pronouns.values())
+INDEX_SUBJECTS = [
+    [subject for subject in all_subjects if get_json_index("indicative", subject) == index]
+    for index in range(len(subject_order))
+]
+
+def explain_answer(question, text):
+    """Describe which other verb, tense or person text is a form of, or return None"""
+    matches = data.form_index.lookup(text)
+    if not matches:
+        return None
+
+    def closeness(match):
+        return (match.verb == question.verb,
+                (match.mood, match.tense) == (question.mood, question.tense),
+                match.is_reflexive == question.is_reflexive)
+
+    match = max(matches, key=closeness)
+    label = f"{french_mood_labels[match.mood]} {french_tense_labels[match.tense]}"
+    if (match.verb, match.is_reflexive) != (question.verb, question.is_reflexive):
+        # A reflexive form is named by its reflexive infinitive, pronoun first as in expected_answer
+        infinitive = f"se {match.verb}" if match.is_reflexive else match.verb
+        return f"« {text} » is {infinitive}, {label} ({match.subject})."
+    if (match.mood, match.tense) != (question.mood, question.tense):
+        return f"« {text} » is the {label} ({match.subject})."
+    return f"« {text} » is the {match.subject} form."
+
 # --- Achievement System ---
 class AchievementSystem:
-    def __init__(self):
-        self.save_file = "achievements.json"
+    def __init__(self, save_file="achievements.json", catalogue=None):
+        self.save_file = save_file  # None keeps progress in memory only
+        self.journal = None
         self.gallery_window = None
         
+        if catalogue is None:
+            self.build_catalogue()
+        else:
+            # Share the milestones and images of another system, e.g. across server sessions
+            for name in self.CATALOGUE:
+                setattr(self, name, getattr(catalogue, name))
+        
+        # Load progress
+        self.load_progress()
+
+    CATALOGUE = ("achievement_categories", "achievement_images", "thresholds", "descriptions", "category_order")
+
+    def build_catalogue(self):
+        """Create the achievement categories and share the gallery images among them"""
         # Create achievement categories with all requested milestones
         self.achievement_categories = {
             "streak": {
@@ -233,16 +1085,18 @@ class AchievementSystem:
                     ]
                 }
         
-        # Load progress
-        self.load_progress()
-        
         # Distribute images to achievements
         self.assign_images_to_achievements()
+        self.index_catalogue()
     
     def all_achievements_completed(self):
         """Check if all achievements have been earned"""
+        return self.achievements_left() <= 0
+
+    def achievements_left(self):
+        """Number of achievements not yet earned"""
         total_achievements = sum(len(cat["milestones"]) for cat in self.achievement_categories.values())
-        return len(self.earned_achievements) >= total_achievements
+        return total_achievements - len(self.earned_achievements)
 
     def assign_images_to_achievements(self):
         """Divide images evenly among achievement categories"""
@@ -259,158 +1113,419 @@ class AchievementSystem:
             ]
     
     def load_progress(self):
-        """Load saved progress from file"""
-        try:
-            if os.path.exists(self.save_file):
-                with open(self.save_file, 'r') as f:
-                    data = json.load(f)
-                    self.earned_achievements = set(tuple(x) for x in data.get("earned", []))
-                    self.counters = data.get("counters", {})
-                    # Store unlocked images as list of tuples (path, description)
-                    self.unlocked_images = [(img, desc) for img, desc in data.get("unlocked_images", [])]
-            else:
-                self.reset_progress()
-        except:
+        """Recover progress from the snapshot and the journal written since"""
+        import progress_journal
+        self.close()
+        if self.save_file is None:
             self.reset_progress()
-    
-    def save_progress(self):
-        """Save current progress to file"""
-        with open(self.save_file, 'w') as f:
-            json.dump({
-                "earned": list(self.earned_achievements),
-                "counters": self.counters,
-                "unlocked_images": self.unlocked_images  # Save as list of tuples
-            }, f)
+            self.index_progress()
+            return
+        journal_file = os.path.splitext(self.save_file)[0] + ".journal"
+        self.journal = progress_journal.ProgressJournal(self.save_file, journal_file)
+        state = self.journal.load()
+        atexit.register(self.journal.close)  # unregistered again by close()
+
+        self.reset_progress()
+        self.earned_achievements = state["earned"]
+        self.counters.update(state["counters"])
+        self.unlocked_images = state["unlocked_images"]
+        self.index_progress()
+
+    def record(self, *event):
+        """Append a progress event to the journal"""
+        if self.journal:
+            try:
+                self.journal.record(*event)
+            except RuntimeError as e:  # progress_journal.JournalError: the writer has failed
+                print(f"{e}; progress from now on will not be saved")
+                self.close()
+
+    def close(self):
+        """Write out pending progress and stop the journal writer"""
+        if self.journal:
+            atexit.unregister(self.journal.close)
+            self.journal.close()
+            self.journal = None
     
     def reset_progress(self):
         """Initialize fresh progress"""
         self.earned_achievements = set()
         self.counters = {category: 0 for category in self.achievement_categories}
         self.unlocked_images = []  # Now a list of tuples
+
+    def index_catalogue(self):
+        """Build the milestone lookups check_achievements works from"""
+        self.thresholds = {
+            category: sorted(threshold for threshold, _ in data["milestones"])
+            for category, data in self.achievement_categories.items()
+        }
+        self.descriptions = {
+            category: dict(data["milestones"])
+            for category, data in self.achievement_categories.items()
+        }
+        self.category_order = {category: i for i, category in enumerate(self.achievement_categories)}
+
+    def index_progress(self):
+        """Build the per-player state check_achievements works from"""
+        # Milestones below the pointer have all been earned
+        self.next_milestone = dict.fromkeys(self.achievement_categories, 0)
+        self.unlocked_paths = {img for img, _ in self.unlocked_images}
+        self.remaining_images = {
+            category: [img for img in images if img not in self.unlocked_paths]
+            for category, images in self.achievement_images.items()
+        }
+        # Everything is re-evaluated once after loading
+        self.touched = set(self.achievement_categories)
     
     def update_counters(self, streak, total, mood, tense):
         """Update all relevant counters"""
         self.counters["streak"] = streak
         self.counters["total"] = total
+        self.record("counter", "streak", streak)
+        self.record("counter", "total", total)
+        self.touched.update(("streak", "total"))
         tense_key = f"tense_{mood}_{tense}"
         if tense_key in self.counters:
             self.counters[tense_key] += 1
+            self.record("counter", tense_key, self.counters[tense_key])
+            self.touched.add(tense_key)
     
     def check_achievements(self):
-        """Check if any new achievements were earned"""
+        """Check if any new achievements were earned by the counters updated since the last check"""
         new_achievements = []
+        touched = sorted(self.touched, key=self.category_order.__getitem__)
+        self.touched.clear()
         
-        for category, data in self.achievement_categories.items():
-            current_value = self.counters.get(category, 0)
+        for category in touched:
+            thresholds = self.thresholds[category]
+            start = self.next_milestone[category]
+            reached = bisect(thresholds, self.counters.get(category, 0))
+            if reached <= start:
+                continue
+            self.next_milestone[category] = reached
             
-            for threshold, description in data["milestones"]:
+            for threshold in thresholds[start:reached]:
                 achievement_key = (category, threshold)
+                if achievement_key in self.earned_achievements:
+                    continue
                 
-                if (current_value >= threshold and 
-                    achievement_key not in self.earned_achievements):
-                    
-                    # Earn the achievement
-                    self.earned_achievements.add(achievement_key)
-                    
-                    # Unlock a random image
-                    available_images = [
-                        img for img in self.achievement_images.get(category, [])
-                        if img not in [u[0] for u in self.unlocked_images]
-                    ]
-                    
-                    if available_images:
-                        unlocked_image = random.choice(available_images)
-                        self.unlocked_images.append((unlocked_image, description))
-                        new_achievements.append({
-                            "image": unlocked_image,
-                            "description": description,
-                            "category": data["name"]
-                        })
-        
-        if new_achievements:
-            self.save_progress()
+                # Earn the achievement
+                description = self.descriptions[category][threshold]
+                self.earned_achievements.add(achievement_key)
+                self.record("earned", category, threshold)
+                
+                # Unlock a random image
+                available_images = self.remaining_images.get(category)
+                if available_images:
+                    i = random.randrange(len(available_images))
+                    available_images[i], available_images[-1] = available_images[-1], available_images[i]
+                    unlocked_image = available_images.pop()
+                    self.unlocked_paths.add(unlocked_image)
+                    self.unlocked_images.append((unlocked_image, description))
+                    self.record("unlocked", unlocked_image, description)
+                    new_achievements.append({
+                        "image": unlocked_image,
+                        "description": description,
+                        "category": self.achievement_categories[category]["name"]
+                    })
         
         return new_achievements
+# --- Backgrounds ---
+BACKGROUND = "Claude_Monet_-_Jardin_à_Sainte-Adresse_bg.gif"
+WIN_BACKGROUND = "win-bg.gif"
+
+
+class BackgroundImages:
+    """Background images decoded once and shared by every window"""
+    def __init__(self):
+        self.images = {}  # path -> PhotoImage
+        self.scaled = {}  # (path, x factor, y factor) -> subsampled PhotoImage
+        self.preloading = set()
+
+    def get(self, path):
+        image = self.images.get(path)
+        if image is None:
+            image = self.images[path] = tk.PhotoImage(file=path)
+        return image
+
+    def fit(self, path, width, height):
+        """Return path subsampled to roughly fill width x height"""
+        image = self.get(path)
+        key = (path, max(1, int(image.width() / max(width, 1))), max(1, int(image.height() / max(height, 1))))
+        if key[1:] == (1, 1):
+            return image
+        scaled = self.scaled.get(key)
+        if scaled is None:
+            scaled = self.scaled[key] = image.subsample(*key[1:])
+        return scaled
+
+    def preload(self, widget, path):
+        """Decode path once Tk is idle, so showing it later doesn't stall"""
+        if path in self.images or path in self.preloading:
+            return
+        self.preloading.add(path)
+
+        def load():
+            try:
+                self.get(path)
+            except Exception as e:
+                print(f"Error preloading {path}: {e}")
+
+        widget.after_idle(load)
+
+
+class BackgroundCanvas:
+    """Canvas filled with a shared background, rescaled once resizing settles"""
+    def __init__(self, parent, images, path, delay=100):
+        self.images = images
+        self.path = path
+        self.delay = delay
+        self.image = images.get(path)  # Raises before any widget is made if the file is unusable
+        self.canvas = tk.Canvas(parent)
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.create_image(0, 0, image=self.image, anchor="nw", tags="bg")
+        self.job = None
+        self.canvas.bind("<Configure>", self.on_configure)
+
+    def on_configure(self, event):
+        if self.job is not None:
+            self.canvas.after_cancel(self.job)
+        self.job = self.canvas.after(self.delay, self.rescale)
+
+    def rescale(self):
+        self.job = None
+        try:
+            self.show(self.path)
+        except Exception as e:
+            print(f"Error resizing background: {e}")
+
+    def show(self, path):
+        """Switch to path, scaled to the current canvas size"""
+        self.image = self.images.fit(path, self.canvas.winfo_width(), self.canvas.winfo_height())
+        self.path = path
+        self.canvas.itemconfig("bg", image=self.image)
+
+
+# --- Gallery ---
+class GalleryTile:
+    """One achievement square; tiles are reused as the gallery scrolls"""
+    def __init__(self, grid):
+        size = grid.square_size
+        self.frame = tk.Frame(grid.canvas,
+                              width=size,
+                              height=size + 40,
+                              bg="#E0E0E0",
+                              highlightbackground="black",
+                              highlightthickness=1)
+        self.frame.grid_propagate(False)
+        self.image_canvas = tk.Canvas(self.frame,
+                                      width=size - 10,
+                                      height=size - 10,
+                                      bg="#E0E0E0",
+                                      highlightthickness=0)
+        self.image_canvas.grid(row=0, column=0, pady=(10, 5), padx=(2, 3))
+        self.label = tk.Label(self.frame,
+                              text="",
+                              wraplength=size - 20,
+                              font=('Arial', 8),
+                              bg="#E0E0E0")
+        self.label.grid(row=1, column=0, sticky='nsew', pady=(5, 0))
+        self.window = grid.canvas.create_window(0, 0, window=self.frame, anchor="nw")
+        self.center = (size - 10) // 2
+        self.path = None
+        self.image = None  # Keep a reference while the tile shows it
+
+    def show(self, grid, index, x, y):
+        grid.canvas.coords(self.window, x, y)
+        self.clear()
+        if index >= len(grid.items):
+            self.label.config(text="")
+            return
+
+        img_path, description = grid.items[index]
+        self.label.config(text=description)
+        self.path = img_path
+        image = grid.thumbnails.get(img_path)
+        if image is not None:
+            self.set_image(img_path, image)
+            return
+        # Placeholder until the thumbnail has been made
+        self.image_canvas.create_text(self.center, self.center, text="…", fill="#808080")
+        grid.thumbnails.request(img_path, lambda image: self.set_image(img_path, image))
+
+    def set_image(self, path, image):
+        if path != self.path:
+            return  # The tile has been recycled since the thumbnail was requested
+        self.image_canvas.delete("all")
+        self.image = image
+        if image is None:
+            self.image_canvas.create_text(self.center, self.center, text="?")
+        else:
+            self.image_canvas.create_image(self.center, self.center, image=image)
+
+    def clear(self):
+        self.image_canvas.delete("all")
+        self.path = None
+        self.image = None
+
+
+class GalleryGrid:
+    """Scrollable grid of achievement tiles that only builds the rows in view"""
+    def __init__(self, parent, items, total, thumbnails, cols=4, square_size=160, pad=5):
+        self.items = items
+        self.thumbnails = thumbnails  # ThumbnailCache sized square_size - 10
+        self.cols = cols
+        self.square_size = square_size
+        self.pad = pad
+        self.tile_width = square_size + 2 * pad
+        self.tile_height = square_size + 40 + 2 * pad
+        self.rows = -(-max(total, len(items)) // cols)
+        self.visible = {}  # row -> tiles showing it
+        self.spare = []
+
+        self.canvas = tk.Canvas(parent, bg='white', highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.configure(
+            yscrollcommand=self.on_scroll,
+            scrollregion=(0, 0, cols * self.tile_width, self.rows * self.tile_height),
+        )
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+
+    @property
+    def squares(self):
+        return self.rows * self.cols
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def scroll(self, units):
+        self.canvas.yview_scroll(units, "units")
+
+    def refresh(self):
+        """Show the rows in view, recycling the tiles of rows scrolled away"""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(0, int(top // self.tile_height))
+        last = min(self.rows, int(bottom // self.tile_height) + 1)
+
+        for row in [row for row in self.visible if not first <= row < last]:
+            self.spare.extend(self.visible.pop(row))
+        for row in range(first, last):
+            if row in self.visible:
+                continue
+            tiles = []
+            for col in range(self.cols):
+                tile = self.spare.pop() if self.spare else GalleryTile(self)
+                tile.show(self, row * self.cols + col,
+                          col * self.tile_width + self.pad, row * self.tile_height + self.pad)
+                tiles.append(tile)
+            self.visible[row] = tiles
+
+        # Park unused tiles out of sight
+        for tile in self.spare:
+            self.canvas.coords(tile.window, -2 * self.tile_width, 0)
+            tile.clear()
+
 # --- Quiz App ---
 class ConjugationQuizApp:
     def __init__(self, root):
+        import_tk()
         self.root = root
         self.root.title("CouCou Conjugasion")
         self.root.minsize(800, 450)
-        self.win_bg_image = None
+        self.backgrounds = BackgroundImages()  # Shared with the gallery windows
+        self.thumbnails = None  # ThumbnailCache, created when the gallery first opens
         
         # Verb selection mode
         self.use_top_verbs = False  # Default to all verbs
-        self.current_verb_set = all_verbs
+        self.current_verb_set = data.all_verbs
+        self.questions = QuestionQueue(self.current_verb_set, weights=question_weights["all_verbs"])
+        self.review = None  # ReviewQueue, created the first time review mode is turned on
+        self.review_mode = False
+        self.adaptive_mode = False
+        self.samplers = {}  # id(verb set) -> AdaptiveSampler, kept learning across toggles
+        self.answer_log = None  # AnswerLog, opened once the first question is up
+        self.asked_at = time.monotonic()
         
         # Initialize systems
-        self.achievement_system = AchievementSystem()
+        self.achievement_system = None  # AchievementSystem, loaded once the first question is up
         self.score = 0
         self.total = 0
         self.streak = 0
         self.submitted = False
         
-        # Font setup
-        try:
-            self.header_font = ("Futura", 14, "bold")
-            self.main_font = ("Futura", 14)
-            self.button_font = ("Futura", 12)
-            self.accent_font = ("Futura", 12)
-            tk.Label(root, text="test", font=self.header_font).destroy()
-        except:
-            self.header_font = ("Arial", 14, "bold")
-            self.main_font = ("Arial", 14)
-            self.button_font = ("Arial", 12)
-            self.accent_font = ("Arial", 12)
-
-        # Set up main window with properly sized background
+        # Font setup (Tk falls back to a default font by itself if Futura is missing)
+        self.header_font = ("Futura", 14, "bold")
+        self.main_font = ("Futura", 14)
+        self.button_font = ("Futura", 12)
+        self.accent_font = ("Futura", 12)
+
+        # Set up main window; the background is drawn in later
         self.setup_main_window()
         
         # UI Setup
         self.setup_ui()
         self.generate_question()
 
+        # Everything the first question doesn't need waits until it is on screen
+        self.startup = deque([self.load_background, self.load_achievements, self.load_answer_log,
+                              self.load_form_index, self.preload_win_background])
+        self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        """Run the next deferred startup stage, letting Tk handle events in between"""
+        if self.startup:
+            self.startup.popleft()()
+        if self.startup:
+            self.root.after_idle(self.finish_startup)
+
+    def load_background(self):
+        try:
+            self.background = BackgroundCanvas(self.main_frame, self.backgrounds, BACKGROUND)
+        except Exception as e:
+            print(f"Error loading background image: {e}")
+            return
+        tk.Misc.lower(self.background.canvas)  # Canvas.lower only restacks canvas items
+
+    def load_achievements(self):
+        """Return the achievement system, loading progress and the gallery first if needed"""
+        if self.achievement_system is None:
+            self.achievement_system = AchievementSystem()
+            self.update_gallery_button()
+        return self.achievement_system
+
+    def load_answer_log(self):
+        if self.answer_log is None:
+            self.answer_log = AnswerLog()
+            atexit.register(self.answer_log.close)
+        return self.answer_log
+
+    def load_form_index(self):
+        """Build the reverse form index now, not on the first wrong answer"""
+        data.form_index
+
+    def update_gallery_button(self):
+        unlocked_count = len(self.achievement_system.unlocked_images)
+        total_images = sum(len(imgs) for imgs in self.achievement_system.achievement_images.values())
+        self.gallery_button.config(text=f"🎨 Gallery ({unlocked_count}/{total_images})")
+
     def setup_main_window(self):
-        """Set up the main window with properly sized background"""
+        """Set up the main window frames; load_background adds the background"""
         # Create main frame
         self.main_frame = tk.Frame(self.root)
         self.main_frame.pack(fill="both", expand=True)
         
-        # Load background image
-        try:
-            self.bg_image = tk.PhotoImage(file="Claude_Monet_-_Jardin_à_Sainte-Adresse_bg.gif")
-            
-            # Create canvas for background
-            self.bg_canvas = tk.Canvas(self.main_frame)
-            self.bg_canvas.pack(fill="both", expand=True)
-            
-            # Add image to canvas
-            self.bg_canvas.create_image(0, 0, image=self.bg_image, anchor="nw", tags="bg")
-            
-            # Bind canvas resize to scale image
-            self.bg_canvas.bind("<Configure>", self.resize_background)
-            
-        except Exception as e:
-            print(f"Error loading background image: {e}")
-            self.main_frame.configure(bg="#F7F6F2")
+        # Plain until load_background covers it
+        self.background = None
+        self.main_frame.configure(bg="#F7F6F2")
         
         # Create content frame (on top of background)
         self.content_frame = tk.Frame(self.main_frame, bg='white', bd=5, relief='groove')
         self.content_frame.place(relx=0.5, rely=0.5, anchor="center", width=700, height=400)
 
-    def resize_background(self, event):
-        """Resize background image to fit canvas"""
-        try:
-            self.bg_canvas.delete("bg")
-            # Create scaled version (simple approach without PIL)
-            self.scaled_bg = self.bg_image.subsample(
-                max(1, int(self.bg_image.width()/event.width)),
-                max(1, int(self.bg_image.height()/event.height))
-            )
-            self.bg_canvas.create_image(0, 0, image=self.scaled_bg, anchor="nw", tags="bg")
-        except Exception as e:
-            print(f"Error resizing background: {e}")
-
     def setup_ui(self):
         # Top frame with score and buttons
         self.top_frame = tk.Frame(self.content_frame, bg="white")
@@ -427,6 +1542,28 @@ class ConjugationQuizApp:
             borderwidth=2)
         self.verb_set_button.pack(side="right", padx=10)
 
+        # Adaptive mode toggle: favour the verbs and tenses answered wrongly
+        self.adaptive_button = tk.Button(
+            self.top_frame,
+            text="🎯 Adaptive",
+            font=self.button_font,
+            command=self.toggle_adaptive_mode,
+            bg="#DDE8CC",
+            relief="ridge",
+            borderwidth=2)
+        self.adaptive_button.pack(side="right", padx=10)
+
+        # Spaced-repetition review mode toggle
+        self.review_button = tk.Button(
+            self.top_frame,
+            text="🧠 Review",
+            font=self.button_font,
+            command=self.toggle_review_mode,
+            bg="#DDE8CC",
+            relief="ridge",
+            borderwidth=2)
+        self.review_button.pack(side="right", padx=10)
+
         self.score_label = tk.Label(
             self.top_frame, 
             text=f"Score: {self.score}", 
@@ -444,12 +1581,10 @@ class ConjugationQuizApp:
         )
         self.streak_label.pack(side="left", padx=10)
 
-        # Gallery button
-        unlocked_count = len(self.achievement_system.unlocked_images)
-        total_images = sum(len(imgs) for imgs in self.achievement_system.achievement_images.values())
+        # Gallery button (counts are filled in by load_achievements)
         self.gallery_button = tk.Button(
             self.top_frame, 
-            text=f"🎨 Gallery ({unlocked_count}/{total_images})", 
+            text="🎨 Gallery", 
             font=self.button_font, 
             command=self.show_gallery, 
             bg="#DDE8CC",
@@ -532,51 +1667,75 @@ class ConjugationQuizApp:
         """Switch between all verbs and top/common verbs"""
         self.use_top_verbs = not self.use_top_verbs
         if self.use_top_verbs:
-            self.current_verb_set = top_verbs
+            self.current_verb_set = data.top_verbs
             self.verb_set_button.config(text="🔀 All Verbs")
         else:
-            self.current_verb_set = all_verbs
+            self.current_verb_set = data.all_verbs
             self.verb_set_button.config(text="🔀 Common Verbs")
+        self.questions.set_verb_set(
+            self.current_verb_set,
+            question_weights["top_verbs" if self.use_top_verbs else "all_verbs"]
+        )
 
         # Regenerate question with new verb set
         self.generate_question()
 
+    def toggle_adaptive_mode(self):
+        """Switch between uniform and error-weighted question picking"""
+        self.adaptive_mode = not self.adaptive_mode
+        self.adaptive_button.config(text="🎲 Uniform" if self.adaptive_mode else "🎯 Adaptive")
+        self.generate_question()
+
+    def adaptive_sampler(self):
+        """The AdaptiveSampler of the current verb set, seeded from the answer log.
+
+        It shares the question queue's QuestionSpace, so it is None until the
+        producer thread has built that.
+        """
+        sampler = self.samplers.get(id(self.current_verb_set))
+        if sampler is None:
+            space = self.questions.built_space(self.current_verb_set)
+            if space is None:
+                return None
+            sampler = AdaptiveSampler(space)
+            sampler.replay(self.load_answer_log())
+            self.samplers[id(self.current_verb_set)] = sampler
+        return sampler
+
+    def toggle_review_mode(self):
+        """Switch between random questions and spaced-repetition review"""
+        self.review_mode = not self.review_mode
+        if self.review_mode and self.review is None:
+            self.review = ReviewQueue()
+        self.review_button.config(text="🎲 Random" if self.review_mode else "🧠 Review")
+        self.generate_question()
+
     def generate_question(self):
         self.submitted = False
         self.answer_entry.config(state="normal")
         self.answer_entry.delete(0, tk.END)
         self.feedback_label.config(text="")
 
-        self.verb = random.choice(self.current_verb_set)
-        
-        # This ensures equal probability for each tense across all moods
-        self.mood, self.tense = random.choice(all_mood_tense_pairs)        
-        self.subject = random.choice(imperative_subjects if self.mood == "imperative" else all_subjects)
-        self.is_reflexive = (self.verb not in not_reflexive_verbs and self.mood != "imperative" and random.random() < 0.15)
-
-        try:
-            if self.tense in compound_tenses.get(self.mood, {}):
-                self.answer = conjugate_compound(self.verb, self.mood, self.tense, self.subject, self.is_reflexive)
-            else:
-                self.answer = conjugate_simple(self.verb, self.mood, self.tense, self.subject)
-                if self.is_reflexive:
-                    pronoun = reflexive_pronouns[self.subject]
-                    self.answer = f"{pronoun} {self.answer}"
-        except Exception as e:
-            print(f"Skipping question due to error: {e}")
-            self.generate_question()
-            return
+        if self.review_mode:
+            question = self.review.next_question(self.questions.next_question)
+        elif self.adaptive_mode:
+            try:
+                sampler = self.adaptive_sampler()
+                question = sampler.make_question() if sampler else self.questions.next_question()
+            except Exception as e:
+                print(f"Adaptive question failed: {e}")
+                question = self.questions.next_question()
+        else:
+            question = self.questions.next_question()
+        self.question = question
+        self.verb, self.mood, self.tense, self.subject, self.is_reflexive, self.answer = question
 
-        display_mood = french_mood_labels.get(self.mood, self.mood)
-        display_tense = french_tense_labels.get(self.tense, self.tense)
-        prompt = f"Conjuguez '{self.verb}'"
-        if self.is_reflexive:
-            prompt += " (réflexif)"
-        prompt += f" au {display_mood} - {display_tense}, sujet : '{self.subject}'"
-        self.question_label.config(text=prompt)
+        self.question_label.config(text=question_prompt(self.verb, self.mood, self.tense, self.subject, self.is_reflexive))
+        self.asked_at = time.monotonic()
 
     def show_gallery(self):
         """Show unlocked achievements in a grid with descriptions"""
+        self.load_achievements()
         if hasattr(self.achievement_system, 'gallery_window') and self.achievement_system.gallery_window and self.achievement_system.gallery_window.winfo_exists():
             self.achievement_system.gallery_window.lift()
             return
@@ -596,29 +1755,7 @@ class ConjugationQuizApp:
         
         # Load background image
         try:
-            bg_image = tk.PhotoImage(file="Claude_Monet_-_Jardin_à_Sainte-Adresse_bg.gif")
-            
-            # Create canvas for background
-            bg_canvas = tk.Canvas(main_frame)
-            bg_canvas.pack(fill="both", expand=True)
-            
-            # Add image to canvas
-            bg_canvas.create_image(0, 0, image=bg_image, anchor="nw", tags="bg")
-            self.gallery_bg_image = bg_image  # Keep reference
-            
-            def resize_bg(event):
-                try:
-                    bg_canvas.delete("bg")
-                    scaled_bg = bg_image.subsample(
-                        max(1, int(bg_image.width()/event.width)),
-                        max(1, int(bg_image.height()/event.height))
-                    )
-                    bg_canvas.create_image(0, 0, image=scaled_bg, anchor="nw", tags="bg")
-                except:
-                    pass
-            
-            bg_canvas.bind("<Configure>", resize_bg)
-            
+            BackgroundCanvas(main_frame, self.backgrounds, BACKGROUND)
         except Exception as e:
             print(f"Error loading background image: {e}")
             main_frame.configure(bg="#F7F6F2")
@@ -637,141 +1774,47 @@ class ConjugationQuizApp:
         container = tk.Frame(content_frame, bg='white')
         container.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Create canvas with scrollbar
-        canvas = tk.Canvas(container, bg='white', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        
-        # Pack canvas and scrollbar
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Create frame inside canvas
-        scroll_frame = tk.Frame(canvas, bg='white')
-        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        # Only the rows in view get widgets; at least the original 4x30 grid
+        unlocked_images = self.achievement_system.unlocked_images  # List of (path, description) tuples
+        if self.thumbnails is None:
+            import thumbnail_cache
+            self.thumbnails = thumbnail_cache.ThumbnailCache(self.root, size=150)
+        grid = GalleryGrid(container, unlocked_images, total=4 * 30, thumbnails=self.thumbnails)
         
         # Enable mouse wheel scrolling
         def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        # Update scroll region when frame size changes
-        def update_scrollregion(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-        scroll_frame.bind("<Configure>", update_scrollregion)
-        
-        # Create 4x30 grid (4 columns, 30 rows)
-        cols = 4
-        rows = 30
-        square_size = 160
-        self.achievement_img_refs = []  # This will store our image references
-        
-        unlocked_images = self.achievement_system.unlocked_images  # List of (path, description) tuples
-        total_squares = cols * rows
-        
-        for i in range(total_squares):
-            row = i // cols
-            col = i % cols
-            
-            # Create frame for each achievement square
-            frame = tk.Frame(scroll_frame, 
-                            width=square_size, 
-                            height=square_size + 40,
-                            bg="#E0E0E0", 
-                            highlightbackground="black", 
-                            highlightthickness=1)
-            frame.grid(row=row, column=col, padx=5, pady=5, sticky='nsew')
-            frame.grid_propagate(False)
-            
-            # Image container (fixed size)
-            img_container = tk.Frame(frame, 
-                                   width=square_size-10, 
-                                   height=square_size-10,
-                                   bg="#E0E0E0")
-            img_container.grid(row=0, column=0, sticky='nsew', pady=(10,5), padx=(2,3))
-            img_container.pack_propagate(False)
-            
-            if i < len(unlocked_images):
-                img_path, description = unlocked_images[i]
-                
-                try:
-                    # Load the image
-                    img = tk.PhotoImage(file=img_path)
-                    
-                    # Create a canvas for the image (instead of a label)
-                    img_canvas = tk.Canvas(img_container, 
-                                          width=square_size-10, 
-                                          height=square_size-10,
-                                          bg="#E0E0E0",
-                                          highlightthickness=0)
-                    img_canvas.pack(expand=True)
-                    
-                    # Calculate scaling to fit while maintaining aspect ratio
-                    img_width = img.width()
-                    img_height = img.height()
-                    
-                    # Calculate the scaling factor
-                    scale = min((square_size-10)/img_width, (square_size-10)/img_height)
-                    new_width = int(img_width * scale)
-                    new_height = int(img_height * scale)
-                    
-                    # Calculate position to center the image
-                    x_pos = ((square_size-10) - new_width) // 2
-                    y_pos = ((square_size-10) - new_height) // 2
-                    
-                    # Create the scaled image
-                    resized_img = img.subsample(
-                        max(1, int(img.width()/new_width)),
-                        max(1, int(img.height()/new_height))
-                    )
-                    
-                    # Add image to canvas at calculated position
-                    img_canvas.create_image(x_pos, y_pos, anchor="nw", image=resized_img)
-                    
-                    # Store the image reference to prevent garbage collection
-                    self.achievement_img_refs.append(resized_img)
-                    
-                    # Display description below image
-                    desc_label = tk.Label(frame, 
-                                        text=description, 
-                                        wraplength=square_size-20,
-                                        font=('Arial', 8),
-                                        bg="#E0E0E0")
-                    desc_label.grid(row=1, column=0, sticky='nsew', pady=(5,0))
-                    
-                except Exception as e:
-                    print(f"Error loading image {img_path}: {e}")
-                    tk.Label(img_container, text="?", bg="#E0E0E0").pack(expand=True)
-            else:
-                # Empty square
-                tk.Label(img_container, text="", bg="#E0E0E0").pack(expand=True)
-        
-        # Configure grid weights
-        for i in range(cols):
-            scroll_frame.columnconfigure(i, weight=1)
-        for i in range(rows):
-            scroll_frame.rowconfigure(i, weight=1)
+            grid.scroll(int(-1*(event.delta/120)))
+        gallery_window.bind_all("<MouseWheel>", _on_mousewheel)
         
         # Display progress text
         progress_label = tk.Label(content_frame,
-                                text=f"Unlocked: {len(unlocked_images)}/{total_squares}",
+                                text=f"Unlocked: {len(unlocked_images)}/{grid.squares}",
                                 font=self.main_font,
                                 bg="white")
         progress_label.pack(side="bottom", pady=10)
         
     def close_gallery(self, window):
         """Properly close the gallery window"""
+        window.unbind_all("<MouseWheel>")
+        self.thumbnails.cancel()
         window.destroy()
         self.achievement_system.gallery_window = None
         
     def check_background_update(self):
         """Check if we should switch to the win background"""
-        if self.achievement_system.all_achievements_completed():
+        if self.background and self.achievement_system.all_achievements_completed():
             try:
-                self.win_bg_image = tk.PhotoImage(file="win-bg.gif")
-                self.bg_canvas.itemconfig("bg", image=self.win_bg_image)
+                self.background.show(WIN_BACKGROUND)
             except Exception as e:
                 print(f"Error loading win background: {e}")
+        else:
+            self.preload_win_background()
+
+    def preload_win_background(self):
+        """Decode the win background in idle time once one answer could earn it"""
+        # A correct answer touches at most three categories: streak, total and its tense
+        if self.background and self.achievement_system and self.achievement_system.achievements_left() <= 3:
+            self.backgrounds.preload(self.root, WIN_BACKGROUND)
 
     def submit_or_next(self, event=None):
         if not self.submitted:
@@ -781,14 +1824,20 @@ class ConjugationQuizApp:
                 
             self.submitted = True
             self.total += 1
-            
-            if user_input == self.answer.lower():
+            correct = user_input == self.answer.lower()
+            if self.review_mode:
+                self.review.record(self.question, correct)
+            for sampler in self.samplers.values():
+                sampler.record(self.question, correct)
+            self.load_answer_log().record(self.question, correct, time.monotonic() - self.asked_at)
+
+            if correct:
                 self.feedback_label.config(text="✅ Correct!", fg="green")
                 self.score += 1
                 self.streak += 1
                 
                 # Update achievement counters
-                self.achievement_system.update_counters(
+                self.load_achievements().update_counters(
                     self.streak,
                     self.score,
                     self.mood,  # Add this parameter
@@ -812,13 +1861,14 @@ class ConjugationQuizApp:
                     
                 # Update gallery button if new images unlocked
                 if new_achievements:
-                    unlocked_count = len(self.achievement_system.unlocked_images)
-                    total_images = sum(len(imgs) for imgs in self.achievement_system.achievement_images.values())
-                    self.gallery_button.config(
-                        text=f"🎨 Gallery ({unlocked_count}/{total_images})"
-                    )
+                    self.update_gallery_button()
             else:
-                self.feedback_label.config(text=f"❌ Incorrect. Correct answer: {self.answer}", fg="red")
+                feedback = f"❌ Incorrect. Correct answer: {self.answer}"
+                # A real form of another tense, person or verb is worth pointing out
+                explanation = explain_answer(self.question, user_input)
+                if explanation:
+                    feedback += f"\n{explanation}"
+                self.feedback_label.config(text=feedback, fg="red")
                 self.streak = 0
             
             self.score_label.config(text=f"Score: {self.score}")
@@ -829,8 +1879,40 @@ class ConjugationQuizApp:
             self.generate_question()
             self.submit_button.config(text="Submit")
 
+# --- Instrumentation ---
+INSTRUMENTED = (
+    ("ConjugationQuizApp", "generate_question"),
+    ("ConjugationQuizApp", "show_gallery"),
+    ("ConjugationQuizApp", "load_background"),
+    ("ConjugationQuizApp", "load_achievements"),
+    ("ConjugationQuizApp", "submit_or_next"),
+    ("AchievementSystem", "check_achievements"),
+    ("AchievementSystem", "record"),
+    ("progress_journal.ProgressJournal", "write_snapshot"),  # on the writer thread
+    ("BackgroundCanvas", "rescale"),
+)
+
+
+def enable_instrumentation(root, path="coucou-profile.json"):
+    """Time the hot paths and watch root's event loop; dump with F12 and on exit"""
+    import importlib
+    import instrumentation
+    profiler = instrumentation.Instrumentation(path)
+    for owner, name in INSTRUMENTED:
+        module, _, owner = owner.rpartition(".")
+        namespace = vars(importlib.import_module(module)) if module else globals()
+        profiler.wrap(namespace[owner], name)
+    profiler.watch(root)
+    root.bind_all("<F12>", lambda event: print(f"Profile written to {profiler.dump()}"))
+    atexit.register(profiler.dump)
+    return profiler
+
 # Run the application
 if __name__ == "__main__":
-    root = tk.Tk()
+    import sys
+    root = import_tk().Tk()
+    profile = os.environ.get("COUCOU_PROFILE") or ("--profile" in sys.argv[1:] and "coucou-profile.json")
+    if profile:
+        enable_instrumentation(root, profile)
     app = ConjugationQuizApp(root)
     root.mainloop()
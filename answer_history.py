@@ -0,0 +1,195 @@
+"""Append-only log of every answer, stored by column, with running totals.
+
+Each answer is one fixed-size record: when it was given, the verb, a code
+packing the (mood, tense) pair, subject, reflexive and correct flags, and
+how long the answer took. Records are appended to the history file as
+they happen and kept in memory as one flat array per column, so a million
+answers take about 20 MB.
+
+Accuracy per pair, per verb and per verb group (template) is updated on
+every append, and a running count of correct answers makes the accuracy
+of any recent window (the last n answers, or everything since a time) an
+O(log n) query however long the history gets.
+"""
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate, compress
+
+MAGIC = b"CCAH"
+VERSION = 1
+HEADER = struct.Struct("<4sI32s")  # magic, version, data digest
+RECORD = struct.Struct("<IIII")    # time (s), verb, code, response time (ms)
+
+# code = pair << 8 | subject << 2 | reflexive << 1 | correct
+CORRECT = 1
+REFLEXIVE = 2
+
+
+def pack_code(pair, subject, is_reflexive, correct):
+    return pair << 8 | subject << 2 | (REFLEXIVE if is_reflexive else 0) | (CORRECT if correct else 0)
+
+
+def unpack_code(code):
+    """Return (pair, subject, is_reflexive, correct)"""
+    return code >> 8, code >> 2 & 0x3F, bool(code & REFLEXIVE), bool(code & CORRECT)
+
+
+class AnswerHistory:
+    def __init__(self, verb_count, pair_count, groups=None, group_count=0,
+                 path=None, digest=b"\0" * 32):
+        self.path = path
+        self.digest = digest
+        self.groups = groups  # verb -> group (e.g. template), or None
+        self.log = None
+
+        # Columns, one entry per answer
+        self.times = array("I")
+        self.verbs = array("I")
+        self.codes = array("I")
+        self.response_ms = array("I")
+        self.correct_before = array("I", [0])  # correct answers among the first i
+
+        # Running totals
+        self.pair_answered = array("I", bytes(4 * pair_count))
+        self.pair_correct = array("I", bytes(4 * pair_count))
+        self.verb_answered = array("I", bytes(4 * verb_count))
+        self.verb_correct = array("I", bytes(4 * verb_count))
+        self.group_answered = array("I", bytes(4 * group_count))
+        self.group_correct = array("I", bytes(4 * group_count))
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self.codes)
+
+    # --- Recording ---
+    def record(self, verb, pair, subject, is_reflexive, correct, response_time, when):
+        """Log one answer; response_time is in seconds and when in epoch seconds"""
+        code = pack_code(pair, subject, is_reflexive, correct)
+        row = (int(when), verb, code, min(max(int(response_time * 1000), 0), 0xFFFFFFFF))
+        self.add(*row)
+        if self.log:
+            self.log.write(RECORD.pack(*row))
+            self.log.flush()
+
+    def add(self, when, verb, code, response_ms):
+        correct = code & CORRECT
+        self.times.append(when)
+        self.verbs.append(verb)
+        self.codes.append(code)
+        self.response_ms.append(response_ms)
+        self.correct_before.append(self.correct_before[-1] + correct)
+
+        pair = code >> 8
+        self.pair_answered[pair] += 1
+        self.pair_correct[pair] += correct
+        self.verb_answered[verb] += 1
+        self.verb_correct[verb] += correct
+        if self.groups is not None:
+            group = self.groups[verb]
+            self.group_answered[group] += 1
+            self.group_correct[group] += correct
+
+    # --- Queries ---
+    def window(self, last=None, since=None):
+        """Return (answered, correct) over the last `last` answers or those since `since`"""
+        end = len(self.codes)
+        start = 0
+        if last is not None:
+            start = max(start, end - last)
+        if since is not None:
+            start = max(start, bisect_left(self.times, since))
+        return end - start, self.correct_before[end] - self.correct_before[start]
+
+    def accuracy(self, last=None, since=None):
+        answered, correct = self.window(last, since)
+        return correct / answered if answered else None
+
+    def pair_accuracy(self):
+        """Return {pair: (answered, correct)} for every pair answered at least once"""
+        return {
+            pair: (answered, self.pair_correct[pair])
+            for pair, answered in enumerate(self.pair_answered) if answered
+        }
+
+    def verb_accuracy(self, verb):
+        return self.verb_answered[verb], self.verb_correct[verb]
+
+    def group_accuracy(self, group):
+        return self.group_answered[group], self.group_correct[group]
+
+    def weakest_verbs(self, count=10, minimum=3):
+        """Verbs answered at least `minimum` times, lowest accuracy first"""
+        answered, correct = self.verb_answered, self.verb_correct
+        verbs = [verb for verb, n in enumerate(answered) if n >= minimum]
+        verbs.sort(key=lambda verb: correct[verb] / answered[verb])
+        return verbs[:count]
+
+    def row(self, index):
+        """Return (time, verb, pair, subject, is_reflexive, correct, response_ms)"""
+        return (self.times[index], self.verbs[index], *unpack_code(self.codes[index]),
+                self.response_ms[index])
+
+    # --- Persistence ---
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(HEADER.size)
+                body = f.read()
+        except FileNotFoundError:
+            header = body = b""
+
+        if header and (len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION, self.digest)):
+            # The verb and pair ids would no longer mean the same thing
+            old_path = self.path + ".old"
+            print(f"Answer history in {self.path} was saved for other verb data; keeping it as {old_path}")
+            os.replace(self.path, old_path)
+            header = body = b""
+        if not header:
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, self.digest))
+
+        usable = len(body) - len(body) % RECORD.size  # a crash can leave a torn last record
+        self.extend(body[:usable])
+        self.log = open(self.path, "ab")
+        if usable != len(body):
+            self.log.truncate(HEADER.size + usable)
+
+    def extend(self, records):
+        """Append packed records in bulk; Python only loops over distinct codes and verbs"""
+        rows = array("I")
+        rows.frombytes(records)
+        if sys.byteorder == "big":
+            rows.byteswap()
+        times, verbs, codes, response_ms = rows[0::4], rows[1::4], rows[2::4], rows[3::4]
+        correct = array("B", map(CORRECT.__and__, codes))
+
+        self.times += times
+        self.verbs += verbs
+        self.codes += codes
+        self.response_ms += response_ms
+        self.correct_before += array("I", accumulate(correct, initial=self.correct_before[-1]))[1:]
+
+        # Codes only take a few hundred values, and say both the pair and correctness
+        for code, count in Counter(codes).items():
+            self.pair_answered[code >> 8] += count
+            if code & CORRECT:
+                self.pair_correct[code >> 8] += count
+        groups = self.groups
+        for verb, count in Counter(verbs).items():
+            self.verb_answered[verb] += count
+            if groups is not None:
+                self.group_answered[groups[verb]] += count
+        for verb, count in Counter(compress(verbs, correct)).items():
+            self.verb_correct[verb] += count
+            if groups is not None:
+                self.group_correct[groups[verb]] += count
+
+    def close(self):
+        if self.log:
+            self.log.close()
+            self.log = None
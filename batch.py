@@ -0,0 +1,27 @@
+"""Helpers shared by the batch tools: export.py, worksheet.py and grade.py."""
+import os
+from collections import deque
+from itertools import islice
+
+
+def guess_format(path, extensions):
+    """The format that extensions (extension -> format) gives path's extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in extensions:
+        return extensions[extension]
+    raise ValueError(f"Can't tell the format of {path}; pass --format")
+
+
+def ordered_results(pool, function, items, ahead):
+    """Yield function(*item) for each item in order, run on pool at most ahead items ahead.
+
+    Holding a bounded number of results keeps memory flat however many
+    items there are, while the pool still has work queued behind the one
+    being waited for.
+    """
+    items = iter(items)
+    in_flight = deque(pool.submit(function, *item) for item in islice(items, ahead))
+    while in_flight:
+        result = in_flight.popleft().result()
+        in_flight.extend(pool.submit(function, *item) for item in islice(items, 1))
+        yield result
@@ -0,0 +1,958 @@
+"""Benchmarks for the CouCou engine, achievement system and startup.
+
+Stdlib only and headless (no display needed):
+
+    python bench.py                      # run everything, print results
+    python bench.py -o results.json      # ... and save them as JSON
+    python bench.py find_group paradigm  # run a subset
+    python bench.py --compare before.json after.json
+"""
+import argparse
+import bisect
+import contextlib
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+
+# Data files are opened relative to the repo; output paths relative to the caller
+INVOCATION_DIR = os.getcwd()
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.getcwd())
+
+import CouCou
+import export
+import grade
+import server
+import spaced_repetition
+import thumbnail_cache
+import worksheet
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def best_of(runs, func, *args):
+    return min(timed(func, *args) for _ in range(runs))
+
+
+@contextlib.contextmanager
+def in_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+
+
+# --- Template Resolution ---
+def find_group_linear(verb):
+    """The original scan over conjugation_data, kept as a reference point"""
+    for key in CouCou.conjugation_data:
+        if ":" not in key:
+            continue
+        prefix, root = key.split(":")
+        if verb == prefix + root:
+            return key
+    return None
+
+
+def bench_find_group():
+    verbs = CouCou.all_verbs
+
+    def run(lookup):
+        for verb in verbs:
+            lookup(verb)
+
+    linear = timed(run, find_group_linear)
+    indexed = timed(run, CouCou.find_group)
+    resolved = timed(run, CouCou.resolve_template)
+    return {
+        "verbs": len(verbs),
+        "find_group_linear_s": linear,
+        "find_group_indexed_s": indexed,
+        "resolve_template_s": resolved,
+        "speedup": linear / indexed if indexed else float("inf"),
+    }
+
+
+# --- Conjugation Throughput ---
+def conjugate_grid(verbs, compound):
+    """Call the per-form functions for every pair of one kind; return (ok, failed)"""
+    ok = failed = 0
+    for verb in verbs:
+        for mood, tense in CouCou.all_mood_tense_pairs:
+            if (tense in CouCou.compound_tenses.get(mood, {})) != compound:
+                continue
+            subjects = CouCou.imperative_subjects if mood == "imperative" else CouCou.all_subjects
+            for subject in subjects:
+                try:
+                    if compound:
+                        CouCou.conjugate_compound(verb, mood, tense, subject, False)
+                        CouCou.conjugate_compound(verb, mood, tense, subject, True)
+                        ok += 2
+                    else:
+                        CouCou.conjugate_simple(verb, mood, tense, subject)
+                        ok += 1
+                except Exception:
+                    failed += 1
+    return ok, failed
+
+
+def bench_conjugate_simple():
+    verbs = list(CouCou.all_verbs)
+    start = time.perf_counter()
+    ok, failed = conjugate_grid(verbs, compound=False)
+    elapsed = time.perf_counter() - start
+    return {"verbs": len(verbs), "forms": ok, "failed": failed,
+            "total_s": elapsed, "forms_per_s": ok / elapsed}
+
+
+def bench_conjugate_compound():
+    verbs = list(CouCou.all_verbs)
+    start = time.perf_counter()
+    ok, failed = conjugate_grid(verbs, compound=True)
+    elapsed = time.perf_counter() - start
+    return {"verbs": len(verbs), "forms": ok, "failed": failed,
+            "total_s": elapsed, "forms_per_s": ok / elapsed}
+
+
+def bench_paradigm(sample=500):
+    verbs = list(CouCou.all_verbs)
+
+    start = time.perf_counter()
+    rows = sum(1 for _ in CouCou.conjugate_many(verbs))
+    batched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simple, _ = conjugate_grid(verbs[:sample], compound=False)
+    compound, _ = conjugate_grid(verbs[:sample], compound=True)
+    single = time.perf_counter() - start
+
+    return {
+        "verbs": len(verbs),
+        "forms": rows,
+        "conjugate_many_s": batched,
+        "conjugate_many_forms_per_s": rows / batched,
+        "per_call_sample_verbs": sample,
+        "per_call_forms_per_s": (simple + compound) / single,
+    }
+
+
+def allocated(func):
+    """Return (result, bytes still allocated by func's result, seconds)"""
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def bench_templates():
+    """Every template decoded into Python objects, against the raw json.load tree"""
+    import conjugation_cache
+    sources = []
+    for path in ("verbs-fr.json", "conjugation-fr.json"):
+        with open(path, "rb") as f:
+            sources.append(f.read())
+    _, json_bytes, json_s = allocated(lambda: [json.loads(source) for source in sources])
+    verbs, conjugations = (json.loads(source) for source in sources)
+    compiled_bytes = conjugation_cache.compile_tables(verbs, conjugations)
+    compile_s = timed(conjugation_cache.compile_tables, verbs, conjugations)
+
+    compiled = conjugation_cache.CompiledConjugations(compiled_bytes)
+    _, decoded_bytes, decode_s = allocated(lambda: [compiled.templates[t] for t in compiled.templates])
+    return {
+        "templates": len(conjugations),
+        "vectors": len(compiled._vec_start),
+        "cache_bytes": len(compiled_bytes),
+        "compile_s": compile_s,
+        "json_load_s": json_s,
+        "json_load_bytes": json_bytes,
+        "load_cache_s": timed(conjugation_cache.CompiledConjugations, compiled_bytes),
+        "decode_all_templates_s": decode_s,
+        "decode_all_templates_bytes": decoded_bytes,
+    }
+
+
+def bench_reverse_lookup(sample=5000):
+    import random
+    rng = random.Random(1)
+    CouCou.data.__dict__.pop("form_index", None)
+    build = timed(lambda: CouCou.data.form_index)
+    index = CouCou.data.form_index
+
+    verbs = rng.sample(list(CouCou.all_verbs), 200)
+    forms = rng.sample([row[5] for row in CouCou.conjugate_many(verbs)], sample)
+    misses = ["".join(rng.sample(form, len(form))) for form in forms]
+    return {
+        "build_s": build,
+        "endings": len(index.endings),
+        "lookup_form_s": timed(lambda: [index.lookup(form) for form in forms]) / sample,
+        "lookup_miss_s": timed(lambda: [index.lookup(form) for form in misses]) / sample,
+    }
+
+
+# --- Questions ---
+def bench_questions(count=50_000):
+    results = {}
+    for name, verb_set in (("all_verbs", CouCou.all_verbs), ("top_verbs", CouCou.top_verbs)):
+        failed = 0
+        start = time.perf_counter()
+        for _ in range(count):
+            question = CouCou.pick_question(verb_set)
+            try:
+                CouCou.expected_answer(*question)
+            except Exception:
+                failed += 1
+        elapsed = time.perf_counter() - start
+        results[f"{name}_per_question_s"] = elapsed / count
+        results[f"{name}_failed_ratio"] = failed / count
+
+        start = time.perf_counter()
+        space = CouCou.QuestionSpace(verb_set)
+        results[f"{name}_space_build_s"] = time.perf_counter() - start
+        results[f"{name}_space_combinations"] = len(space)
+        start = time.perf_counter()
+        for _ in range(count):
+            space.make_question()
+        results[f"{name}_space_per_question_s"] = (time.perf_counter() - start) / count
+    results["questions"] = count
+
+    # "Next Question" with the background producer: pop latency once it has caught up
+    producer = CouCou.QuestionQueue(CouCou.all_verbs)
+    pops = []
+    for _ in range(200):
+        while not producer.queue.full():
+            time.sleep(0.001)
+        pops.append(timed(producer.next_question))
+    results["queued_next_question_median_s"] = statistics.median(pops)
+    return results
+
+
+def bench_memo(count=50_000):
+    """expected_answer over realistic question streams, with and without the memo"""
+    import random
+    results = {"questions": count}
+    sizes = {name: memo.maxsize for name, memo in CouCou.MEMOS.items()}
+    for name, verb_set in (("all_verbs", CouCou.all_verbs), ("top_verbs", CouCou.top_verbs)):
+        space = CouCou.QuestionSpace(verb_set, CouCou.question_weights[name])
+        rng = random.Random(1)
+        stream = [space.make_question(rng)[:5] for _ in range(count)]
+
+        def answer_all():
+            for question in stream:
+                CouCou.expected_answer(*question)
+
+        try:
+            for memo in CouCou.MEMOS.values():
+                memo.resize(0)
+            results[f"{name}_uncached_per_question_s"] = timed(answer_all) / count
+            for memo_name, memo in CouCou.MEMOS.items():
+                memo.resize(sizes[memo_name])
+                memo.hits = memo.misses = memo.evictions = 0
+            results[f"{name}_memo_per_question_s"] = timed(answer_all) / count
+            for memo_name, stats in CouCou.memo_stats().items():
+                results[f"{name}_{memo_name}_hit_rate"] = stats["hit_rate"]
+                results[f"{name}_{memo_name}_evictions"] = stats["evictions"]
+        finally:
+            for memo_name, memo in CouCou.MEMOS.items():
+                memo.resize(sizes[memo_name])
+            CouCou.clear_memos()
+    return results
+
+
+def bench_adaptive(answers=20_000, hard_share=0.1):
+    """Draw + update per answer, and how often a learner's weak verbs come up"""
+    import random
+    from itertools import accumulate
+    results = {"answers": answers}
+    for name, verb_set in (("all_verbs", CouCou.all_verbs), ("top_verbs", CouCou.top_verbs)):
+        rng = random.Random(1)
+        space = CouCou.QuestionSpace(verb_set, CouCou.question_weights[name])
+        sampler = CouCou.AdaptiveSampler(space)
+        # A simulated learner who always misses the hard verbs and knows the rest
+        hard = {verb for verb in verb_set if rng.random() < hard_share}
+
+        start = time.perf_counter()
+        hits = 0
+        for i in range(answers):
+            question = sampler.make_question(rng)
+            sampler.record(question, question.verb not in hard)
+            if i >= answers // 2:
+                hits += question.verb in hard
+        results[f"{name}_per_answer_s"] = (time.perf_counter() - start) / answers
+        results[f"{name}_weak_verb_share"] = hits / (answers - answers // 2)
+        results[f"{name}_weak_verb_share_uniform"] = len(hard) / len(verb_set)
+
+        # The same update through a cumulative list rebuilt after every answer
+        weights = list(sampler.tree.weights)
+
+        def rebuild_and_draw():
+            for i in range(200):
+                weights[i % len(weights)] = 0.5
+                cumulative = list(accumulate(weights))
+                bisect.bisect(cumulative, rng.random() * cumulative[-1])
+
+        results[f"{name}_rebuild_per_answer_s"] = timed(rebuild_and_draw) / 200
+        results[f"{name}_tree_draw_update_s"] = timed(
+            lambda: [sampler.tree.set(i % len(weights), 0.5) or sampler.tree.sample(rng) for i in range(200)]) / 200
+    return results
+
+
+# --- Spaced Repetition ---
+def scheduler_bytes(scheduler):
+    arrays = (scheduler.box, scheduler.due, scheduler.heap, scheduler.slot)
+    return sum(a.buffer_info()[1] * a.itemsize for a in arrays)
+
+
+def review_step_latency(scheduler, steps, rng):
+    start = time.perf_counter()
+    for _ in range(steps):
+        item = scheduler.next_due()
+        if item is None:
+            item = rng.randrange(scheduler.size)
+        scheduler.record(item, rng.random() < 0.8)
+    return (time.perf_counter() - start) / steps
+
+
+def bench_review(steps=50_000):
+    import random
+    rng = random.Random(1)
+    size = len(CouCou.all_verbs) * len(CouCou.all_mood_tense_pairs) * len(CouCou.all_subjects)
+    scheduler = spaced_repetition.LeitnerScheduler(size)
+    results = {"items": size}
+    for label, coverage in (("1pct", 0.01), ("all", 1.0)):
+        for item in range(int(size * coverage)):
+            if not scheduler.seen(item):
+                scheduler.record(item, True)
+        results[f"seen_{label}"] = len(scheduler.heap)
+        results[f"step_{label}_s"] = review_step_latency(scheduler, steps, rng)
+        results[f"state_bytes_{label}"] = scheduler_bytes(scheduler)
+    return results
+
+
+def bench_export(formats=("sqlite", "csv", "jsonl")):
+    """Export the top verbs in one process and on one worker per CPU"""
+    verbs = CouCou.data.top_verbs
+    workers = os.cpu_count() or 1
+    results = {"verbs": len(verbs), "workers": workers}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            for count in sorted({1, workers}):
+                path = os.path.join(tmp, f"export-{count}.{fmt}")
+                start = time.perf_counter()
+                rows, _ = export.export(path, verbs, fmt, workers=count)
+                results[f"{fmt}_{count}_workers_s"] = time.perf_counter() - start
+        results["rows"] = rows
+    return results
+
+
+def bench_worksheet(count=200_000, formats=("text", "csv", "jsonl")):
+    """Questions per second written by the worksheet generator, per verb set and format"""
+    workers = os.cpu_count() or 1
+    results = {"questions": count, "workers": workers}
+    with tempfile.TemporaryDirectory() as tmp:
+        for verb_set in worksheet.VERB_SETS:
+            for fmt in formats:
+                for n in sorted({1, workers}):
+                    path = os.path.join(tmp, f"sheet-{verb_set}-{n}.{fmt}")
+                    start = time.perf_counter()
+                    worksheet.generate(path, count, fmt, seed=1, verb_set=verb_set, workers=n)
+                    results[f"{verb_set}_{fmt}_{n}_workers_per_s"] = count / (time.perf_counter() - start)
+    return results
+
+
+def bench_grade(rows=50_000):
+    """Grade a worksheet's answers, half of them wrong, per verb set"""
+    results = {"rows": rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        for verb_set in worksheet.VERB_SETS:
+            sheet = os.path.join(tmp, f"sheet-{verb_set}.csv")
+            answers = os.path.join(tmp, f"answers-{verb_set}.csv")
+            worksheet.generate(sheet, rows, seed=1, verb_set=verb_set)
+            with open(sheet, encoding="utf-8", newline="") as f, \
+                    open(answers, "w", encoding="utf-8", newline="") as out:
+                reader = csv.DictReader(f)
+                writer = csv.writer(out)
+                writer.writerow(grade.INPUT_COLUMNS)
+                for i, row in enumerate(reader):
+                    response = row["answer"] if i % 2 else row["answer"] + "s"
+                    writer.writerow([row["verb"], row["mood"], row["tense"], row["subject"],
+                                     row["reflexive"], response])
+            start = time.perf_counter()
+            grade.grade(answers, os.path.join(tmp, f"graded-{verb_set}.csv"))
+            results[f"{verb_set}_s"] = time.perf_counter() - start
+    return results
+
+
+# --- Achievements ---
+def fake_gallery(directory, images):
+    os.makedirs(os.path.join(directory, "Monet-GIF"))
+    for i in range(images):
+        open(os.path.join(directory, "Monet-GIF", f"painting-{i:05d}.gif"), "wb").close()
+
+
+def widen_milestones(system, milestones):
+    """Give every category milestones at 1..milestones answers"""
+    for data in system.achievement_categories.values():
+        data["milestones"] = [(n, f"{n} answers") for n in range(1, milestones + 1)]
+    system.index_catalogue()
+    system.index_progress()
+
+
+def bench_check_achievements(answers=20_000):
+    results = {"answers": answers}
+    pairs = CouCou.all_mood_tense_pairs
+    for images, milestones in ((2000, None), (2000, 1000), (50_000, 1000)):
+        with tempfile.TemporaryDirectory() as tmp, in_directory(tmp):
+            fake_gallery(tmp, images)
+            system = CouCou.AchievementSystem(None)
+            if milestones:
+                widen_milestones(system, milestones)
+            label = f"{sum(map(len, system.thresholds.values()))}_milestones_{images}_images"
+
+            for category in system.counters:
+                system.counters[category] = 1_000_000
+            results[f"first_check_{label}_s"] = timed(system.check_achievements)
+            results[f"unlocked_{label}"] = len(system.unlocked_images)
+
+            system.load_progress()
+            start = time.perf_counter()
+            for i in range(answers):
+                mood, tense = pairs[i % len(pairs)]
+                system.update_counters(i + 1, i + 1, mood, tense)
+                system.check_achievements()
+            results[f"per_answer_{label}_s"] = (time.perf_counter() - start) / answers
+    return results
+
+
+def bench_instrumentation(answers=20_000):
+    """check_achievements per answer, plain and wrapped in a profiling timer"""
+    import instrumentation
+    pairs = CouCou.all_mood_tense_pairs
+    results = {"answers": answers}
+    with tempfile.TemporaryDirectory() as tmp, in_directory(tmp):
+        fake_gallery(tmp, 2000)
+        system = CouCou.AchievementSystem(None)
+
+        def answer_all():
+            for i in range(answers):
+                mood, tense = pairs[i % len(pairs)]
+                system.update_counters(i + 1, i + 1, mood, tense)
+                system.check_achievements()
+
+        results["plain_per_answer_s"] = timed(answer_all) / answers
+        profiler = instrumentation.Instrumentation(os.path.join(tmp, "profile.json"))
+        original = profiler.wrap(CouCou.AchievementSystem, "check_achievements")
+        try:
+            system.load_progress()
+            results["profiled_per_answer_s"] = timed(answer_all) / answers
+        finally:
+            CouCou.AchievementSystem.check_achievements = original
+        results["recorded"] = profiler.histograms["AchievementSystem.check_achievements"].count
+        results["dump_s"] = timed(profiler.dump)
+    return results
+
+
+def bench_answer_history(answers=1_000_000, recorded=20_000):
+    """Recording, reloading and summarising a long answer history"""
+    import random
+    import answer_history
+    rng = random.Random(1)
+    verbs, pairs = len(CouCou.all_verbs), len(CouCou.all_mood_tense_pairs)
+    rows = array("I")
+    for i in range(answers):
+        code = answer_history.pack_code(rng.randrange(pairs), rng.randrange(9),
+                                        rng.random() < 0.15, rng.random() < 0.7)
+        rows.extend((1_700_000_000 + i, rng.randrange(verbs), code, rng.randrange(10_000)))
+    if sys.byteorder == "big":
+        rows.byteswap()
+
+    space = CouCou.QuestionSpace(CouCou.top_verbs)
+    questions = [space.make_question(rng) for _ in range(recorded)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "answer-history.bin")
+        with open(path, "wb") as f:
+            f.write(answer_history.HEADER.pack(answer_history.MAGIC, answer_history.VERSION,
+                                               CouCou.data.compiled_data.digest))
+            f.write(rows.tobytes())
+        start = time.perf_counter()
+        log = CouCou.AnswerLog(path)
+        load_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for i, question in enumerate(questions):
+            log.record(question, i % 3 != 0, 2.5, 1_800_000_000 + i)
+        record_s = (time.perf_counter() - start) / recorded
+        now = 1_800_000_000 + recorded
+        results = {
+            "answers": len(log.history),
+            "load_s": load_s,
+            "bytes_per_answer": sum(
+                column.buffer_info()[1] * column.itemsize
+                for column in (log.history.times, log.history.verbs, log.history.codes,
+                               log.history.response_ms, log.history.correct_before)
+            ) / len(log.history),
+            "record_s": record_s,
+            "summary_s": best_of(5, log.summary, now),
+            "window_last_100_s": best_of(5, log.history.window, 100),
+            "window_since_s": best_of(5, log.history.window, None, now - 3600),
+        }
+        log.close()
+    return results
+
+
+def bench_progress_io(unlocked=20_000, answers=20_000, runs=5):
+    with tempfile.TemporaryDirectory() as tmp, in_directory(tmp):
+        fake_gallery(tmp, 0)
+        system = CouCou.AchievementSystem(os.path.join(tmp, "achievements.json"))
+        for category, data in system.achievement_categories.items():
+            system.counters[category] = 1_000_000
+            system.earned_achievements.update((category, threshold) for threshold, _ in data["milestones"])
+        for i in range(unlocked):
+            image = os.path.join("Monet-GIF", f"painting-{i:05d}.gif")
+            system.unlocked_images.append((image, f"Achievement {i}"))
+            system.record("unlocked", image, f"Achievement {i}")
+        system.journal.flush()
+
+        def snapshot():
+            system.journal.compact()
+            system.journal.flush()
+
+        save = best_of(runs, snapshot)
+        size = os.path.getsize(system.save_file)
+
+        # Per-answer cost on the calling thread, then the time to drain it
+        pairs = CouCou.all_mood_tense_pairs
+        start = time.perf_counter()
+        for i in range(answers):
+            mood, tense = pairs[i % len(pairs)]
+            system.update_counters(i, i, mood, tense)
+        record = (time.perf_counter() - start) / answers
+        drain = timed(system.journal.flush)
+
+        def reload():
+            system.close()
+            return timed(system.load_progress)
+
+        load = min(reload() for _ in range(runs))
+        assert len(system.unlocked_images) == unlocked
+        system.close()
+
+    return {
+        "unlocked_images": unlocked,
+        "file_bytes": size,
+        "snapshot_s": save,
+        "answers": answers,
+        "record_per_answer_s": record,
+        "drain_s": drain,
+        "load_s": load,
+    }
+
+
+# --- Gallery ---
+@contextlib.contextmanager
+def tk_root():
+    """Yield a Tk root window, or None when there is no display"""
+    tk = CouCou.import_tk()
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        yield None
+        return
+    root.geometry("800x600")
+    try:
+        yield root
+    finally:
+        root.destroy()
+
+
+def write_gif(path, width=640, height=480):
+    img = CouCou.tk.PhotoImage(width=width, height=height)
+    img.put("#6d8fb3", to=(0, 0, width, height))
+    img.write(path, format="gif")
+
+
+def bench_gallery(counts=(120, 10_000)):
+    with tk_root() as root, tempfile.TemporaryDirectory() as tmp:
+        if root is None:
+            return {"skipped": "no display"}
+        path = os.path.join(tmp, "painting.gif")
+        write_gif(path)
+        results = {}
+        for count in counts:
+            items = [(path, f"Achievement {i}") for i in range(count)]
+            container = CouCou.tk.Frame(root)
+            container.pack(fill="both", expand=True)
+            start = time.perf_counter()
+            thumbnails = thumbnail_cache.ThumbnailCache(root, 150, os.path.join(tmp, f"thumbnails-{count}"))
+            grid = CouCou.GalleryGrid(container, items, total=120, thumbnails=thumbnails)
+            root.update()
+            results[f"open_{count}_s"] = time.perf_counter() - start
+            results[f"tiles_{count}"] = len(grid.spare) + sum(map(len, grid.visible.values()))
+
+            start = time.perf_counter()
+            for _ in range(200):
+                grid.scroll(3)
+                root.update()
+            results[f"scroll_{count}_s"] = (time.perf_counter() - start) / 200
+            container.destroy()
+        return results
+
+
+def bench_thumbnails(images=200):
+    with tk_root() as root, tempfile.TemporaryDirectory() as tmp:
+        if root is None:
+            return {"skipped": "no display"}
+        paths = [os.path.join(tmp, f"painting-{i:05d}.gif") for i in range(images)]
+        for path in paths:
+            write_gif(path)
+        directory = os.path.join(tmp, "thumbnails")
+
+        def each(func):
+            return timed(lambda: [func(path) for path in paths]) / images
+
+        cache = thumbnail_cache.ThumbnailCache(root, 150, directory, capacity=images)
+        results = {
+            "images": images,
+            "full_decode_s": each(lambda path: CouCou.tk.PhotoImage(file=path)),
+            "generate_s": each(cache.generate),
+            "memory_hit_s": each(cache.get),
+        }
+        cache = thumbnail_cache.ThumbnailCache(root, 150, directory, capacity=images)
+        results["disk_hit_s"] = each(cache.get)
+        return results
+
+
+def bench_backgrounds(steps=60):
+    """Scaling the win background through a simulated window drag"""
+    with tk_root() as root:
+        if root is None:
+            return {"skipped": "no display"}
+        tk = CouCou.tk
+        sizes = [(800 + 10 * i, 450 + 6 * i) for i in range(steps)]
+        image = tk.PhotoImage(file=CouCou.WIN_BACKGROUND)
+
+        def subsample_each_event():
+            for width, height in sizes:
+                image.subsample(max(1, int(image.width() / width)), max(1, int(image.height() / height)))
+
+        images = CouCou.BackgroundImages()
+        return {
+            "steps": steps,
+            "decode_s": timed(lambda: tk.PhotoImage(file=CouCou.WIN_BACKGROUND)),
+            "subsample_each_event_s": timed(subsample_each_event),
+            "shared_first_drag_s": timed(lambda: [images.fit(CouCou.WIN_BACKGROUND, *size) for size in sizes]),
+            "shared_next_drag_s": timed(lambda: [images.fit(CouCou.WIN_BACKGROUND, *size) for size in sizes]),
+        }
+
+
+TIME_TO_INTERACTIVE_TARGET_S = 0.1
+
+
+def cold_queue_question(verb_set, weights):
+    """Time from creating a QuestionQueue to its first question, before the producer has a space"""
+    start = time.perf_counter()
+    questions = CouCou.QuestionQueue(verb_set, weights=weights)
+    questions.next_question()
+    elapsed = time.perf_counter() - start
+    while not questions.queue.full():  # let the producer go idle before the next run
+        time.sleep(0.01)
+    return elapsed
+
+
+def bench_time_to_interactive(images=2000, runs=5):
+    """Time from building the app to the first question, and to the end of deferred startup.
+
+    The first question should be up within TIME_TO_INTERACTIVE_TARGET_S
+    whatever the size of the gallery and background. The first question off
+    a cold QuestionQueue is timed without a display too, since the window
+    waits for it.
+    """
+    # The quiz data is loaded up front; this measures the queue and the window
+    CouCou.data.top_verbs, CouCou.data.not_reflexive_verbs
+    CouCou.make_question(CouCou.data.all_verbs)
+    results = {}
+    for name in ("all_verbs", "top_verbs"):
+        worst = max(cold_queue_question(getattr(CouCou.data, name), CouCou.question_weights[name])
+                    for _ in range(runs))
+        results[f"cold_queue_{name}_s"] = worst
+    results["cold_queue_target_met"] = all(t <= TIME_TO_INTERACTIVE_TARGET_S for t in results.values())
+
+    with tk_root() as root:
+        if root is None:
+            return {**results, "skipped": "no display"}
+        stamps = []
+        finish_startup = CouCou.ConjugationQuizApp.finish_startup
+
+        def stamped(app):
+            stamps.append(time.perf_counter())  # the first question has been drawn by now
+            finish_startup(app)
+            stamps.append(time.perf_counter())
+
+        with tempfile.TemporaryDirectory() as tmp, in_directory(tmp):
+            fake_gallery(tmp, images)
+            write_gif(CouCou.BACKGROUND, 1920, 1080)
+            CouCou.ConjugationQuizApp.finish_startup = stamped
+            app = None
+            try:
+                start = time.perf_counter()
+                app = CouCou.ConjugationQuizApp(root)
+                built = time.perf_counter()
+                while app.startup:
+                    root.update()
+            finally:
+                CouCou.ConjugationQuizApp.finish_startup = finish_startup
+                if app and app.achievement_system:
+                    app.achievement_system.close()
+        return {
+            **results,
+            "images": images,
+            "constructor_s": built - start,
+            "first_question_s": stamps[0] - start,
+            "startup_complete_s": stamps[-1] - start,
+            "stages": len(stamps) // 2,
+            "target_met": stamps[0] - start <= TIME_TO_INTERACTIVE_TARGET_S,
+        }
+
+
+# --- Server ---
+def bench_server(sessions=100, rounds=20):
+    import asyncio
+    process, host, port = server.start_local_server()
+    try:
+        return asyncio.run(server.run_load(host, port, sessions, rounds))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+# --- Startup ---
+COLD_IMPORT = """
+import time
+start = time.perf_counter()
+import CouCou
+print(time.perf_counter() - start)
+"""
+
+# --- Shared memory ---
+TABLES_WORKER = """
+import importlib, json, sys
+import CouCou
+mode = sys.argv[1]
+for module in sys.argv[2:]:  # a baseline importing what a mode's worker imports
+    importlib.import_module(module)
+if mode == "json":  # every worker parsing the sources itself, as before the cache
+    with open("verbs-fr.json", encoding="utf-8") as f:
+        CouCou.data.__dict__["verbs_data"] = json.load(f)
+    with open("conjugation-fr.json", encoding="utf-8") as f:
+        CouCou.data.__dict__["conjugation_data"] = json.load(f)
+if mode != "bare":
+    for verb in CouCou.data.all_verbs[::7]:
+        try:
+            CouCou.find_group(verb)
+            CouCou.get_auxiliary(verb, False)
+            CouCou.conjugate_simple(verb, "indicative", "present", "nous")
+        except Exception:
+            pass
+print("ready", flush=True)
+sys.stdin.readline()  # measure once every worker is up, so shared pages count as shared
+memory = {}
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        name, _, value = line.partition(":")
+        if name in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+            memory[name] = int(value.split()[0])
+print(memory["Rss"], memory["Pss"], memory["Private_Clean"] + memory["Private_Dirty"], flush=True)
+"""
+
+# What each mode's worker imports on top of CouCou, so its baseline can too
+MODE_IMPORTS = {"json": [], "cache": [], "shared": ["multiprocessing.shared_memory"]}
+
+
+def worker_memory(mode, workers, env, imports=()):
+    """Start workers at once; return their mean (RSS, PSS, USS) in KB"""
+    processes = [
+        subprocess.Popen([sys.executable, "-c", TABLES_WORKER, mode, *imports], env=env, text=True,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.stdout.readline()
+    samples = []
+    for process in processes:
+        stdout, _ = process.communicate("go\n")
+        samples.append([int(x) for x in stdout.split()])
+    return [statistics.mean(column) for column in zip(*samples)]
+
+
+def bench_shared_memory(workers=4):
+    """Memory of each quiz worker: own JSON, the mapped cache file, or published tables.
+
+    The tables' share of a worker is its PSS and USS (private memory) over a
+    bare worker that imports the same modules but loads no data; the shared
+    mode's imports (multiprocessing, hashlib, ...) are reported on their own.
+    """
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        return {"skipped": "needs /proc/self/smaps_rollup"}
+    import conjugation_cache
+    results = {"workers": workers}
+    _, _, bare_uss = worker_memory("bare", workers, os.environ)
+    block = conjugation_cache.publish()
+    try:
+        for mode in ("json", "cache", "shared"):
+            env = dict(os.environ, COUCOU_SHARED_TABLES=block.name) if mode == "shared" else os.environ
+            _, base_pss, base_uss = worker_memory("bare", workers, env, MODE_IMPORTS[mode])
+            rss, pss, uss = worker_memory(mode, workers, env)
+            results[f"{mode}_rss_kb"] = rss
+            results[f"{mode}_tables_pss_kb"] = round(pss - base_pss)
+            results[f"{mode}_tables_uss_kb"] = round(uss - base_uss)
+            if MODE_IMPORTS[mode]:
+                results[f"{mode}_imports_uss_kb"] = round(base_uss - bare_uss)
+    finally:
+        block.close()
+        block.unlink()
+    return results
+
+
+FIRST_QUESTION = """
+import sys, time
+start = time.perf_counter()
+import CouCou
+CouCou.data.cache_path = sys.argv[1]  # nothing is loaded until the first question
+while True:
+    try:
+        CouCou.expected_answer(*CouCou.pick_question(CouCou.all_verbs))
+        break
+    except Exception:
+        pass
+print(time.perf_counter() - start)
+"""
+
+
+def run_timed_snippet(code, *args):
+    """Run code in a fresh interpreter and return the time it prints"""
+    output = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def bench_cold_start(runs=9):
+    # The first run after a data change pays for recompiling the cache; compile
+    # into a scratch directory so the cache next to the data is left alone
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "conjugation-fr.cache")
+        rebuild = run_timed_snippet(FIRST_QUESTION, cache_path)
+        return {
+            "runs": runs,
+            "import_median_s": statistics.median(run_timed_snippet(COLD_IMPORT) for _ in range(runs)),
+            "first_question_rebuild_s": rebuild,
+            "first_question_median_s": statistics.median(
+                run_timed_snippet(FIRST_QUESTION, cache_path) for _ in range(runs)
+            ),
+        }
+
+
+BENCHMARKS = {
+    "find_group": bench_find_group,
+    "conjugate_simple": bench_conjugate_simple,
+    "conjugate_compound": bench_conjugate_compound,
+    "paradigm": bench_paradigm,
+    "templates": bench_templates,
+    "reverse_lookup": bench_reverse_lookup,
+    "questions": bench_questions,
+    "memo": bench_memo,
+    "adaptive": bench_adaptive,
+    "review": bench_review,
+    "export": bench_export,
+    "worksheet": bench_worksheet,
+    "grade": bench_grade,
+    "check_achievements": bench_check_achievements,
+    "progress_io": bench_progress_io,
+    "answer_history": bench_answer_history,
+    "instrumentation": bench_instrumentation,
+    "gallery": bench_gallery,
+    "thumbnails": bench_thumbnails,
+    "backgrounds": bench_backgrounds,
+    "time_to_interactive": bench_time_to_interactive,
+    "server": bench_server,
+    "shared_memory": bench_shared_memory,
+    "cold_start": bench_cold_start,
+}
+
+
+# --- Reporting ---
+def print_results(results):
+    for name, metrics in results.items():
+        print(f"{name}:")
+        for key, value in metrics.items():
+            print(f"  {key}: {value:.6f}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+def compare(before_path, after_path):
+    """Print every timing metric of two saved runs side by side"""
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)["results"]
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+    for name in after:
+        if name not in before:
+            continue
+        print(f"{name}:")
+        for key, new in after[name].items():
+            old = before[name].get(key)
+            if not key.endswith("_s") or not isinstance(old, (int, float)) or not old:
+                continue
+            print(f"  {key}: {old:.6f} -> {new:.6f} ({new / old:.2f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", metavar="NAME",
+                        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two JSON result files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*(os.path.join(INVOCATION_DIR, path) for path in args.compare))
+        return
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in args.benchmarks or BENCHMARKS:
+        results[name] = BENCHMARKS[name]()
+        print_results({name: results[name]})
+
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+"""Compiled, memory-mappable form of the conjugation data.
+
+compile_tables() flattens verbs-fr.json and conjugation-fr.json into one
+UTF-8 string table plus flat u32 arrays; identical tense vectors are stored
+once and shared by every template using them. load() maps the compiled file
+read-only and recompiles it whenever the source JSON changes, so startup
+never has to parse the JSON. publish() copies the tables into shared memory
+so worker processes can attach() to one copy instead.
+
+Run `python conjugation_cache.py` to (re)build the cache explicitly.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+
+MAGIC = b"CCJC"
+VERSION = 2
+
+NONE = 0xFFFFFFFF          # missing value / JSON null
+LIST_FLAG = 0x80000000     # value is a list of strings joined by LIST_SEP
+LIST_SEP = "\x1f"
+SCALAR_FLAG = 0x10000      # vector came from a single {"i": ...} object, not a list
+
+# Every section is a native-endian u32 array except the string blob.
+SECTIONS = (
+    "str_off", "str_blob",
+    "slot_mood", "slot_tense",
+    "tpl_name", "tpl_slots",
+    "vec_start", "vec_info",
+    "el_key", "el_val",
+    "verb_name", "verb_tpl", "verb_aux",
+    "ent_name", "ent_verb", "ent_group", "ent_tpl", "ent_plen",
+    "hash_slots",
+)
+HEADER = struct.Struct("<4sI32s" + "QQ" * len(SECTIONS))
+
+
+def source_digest(*sources):
+    """Hash the raw source files together with the format version and byte order"""
+    import hashlib  # deferred: OpenSSL bindings are slow to import
+    digest = hashlib.sha256(f"{VERSION}:{sys.byteorder}".encode())
+    for source in sources:
+        digest.update(len(source).to_bytes(8, "little"))
+        digest.update(source)
+    return digest.digest()
+
+
+# --- Compiler ---
+class _Builder:
+    def __init__(self):
+        self.strings = {}
+        self.vectors = {}  # (info, elements) -> vector id
+        self.sections = {name: array("I") for name in SECTIONS if name != "str_blob"}
+
+    def string(self, text):
+        sid = self.strings.get(text)
+        if sid is None:
+            sid = self.strings[text] = len(self.strings)
+        return sid
+
+    def value(self, value):
+        if value is None:
+            return NONE
+        if isinstance(value, str):
+            return self.string(value)
+        if isinstance(value, list) and value and all(isinstance(v, str) for v in value):
+            return LIST_FLAG | self.string(LIST_SEP.join(value))
+        raise ValueError(f"Unsupported value in conjugation data: {value!r}")
+
+    def element(self, element):
+        """Return the (key, value) pair of a one-entry form dict"""
+        if not isinstance(element, dict) or len(element) > 1:
+            raise ValueError(f"Unsupported form in conjugation data: {element!r}")
+        for key, value in element.items():
+            return self.string(key), self.value(value)
+        return NONE, NONE
+
+    def vector(self, forms):
+        if isinstance(forms, list):
+            key = (len(forms), tuple(self.element(element) for element in forms))
+        else:
+            key = (1 | SCALAR_FLAG, (self.element(forms),))
+        vector = self.vectors.get(key)
+        if vector is None:
+            s = self.sections
+            vector = self.vectors[key] = len(s["vec_start"])
+            s["vec_start"].append(len(s["el_key"]))
+            s["vec_info"].append(key[0])
+            for element_key, value in key[1]:
+                s["el_key"].append(element_key)
+                s["el_val"].append(value)
+        return vector
+
+
+def compile_tables(verbs, conjugations, digest=b"\0" * 32):
+    """Flatten the parsed JSON into the binary cache format and return it as bytes"""
+    b = _Builder()
+    s = b.sections
+
+    slots = {}
+    template_vectors = []
+    template_ids = {}
+    for template, moods in conjugations.items():
+        template_ids[template] = len(template_ids)
+        s["tpl_name"].append(b.string(template))
+        vectors = {}
+        for mood, tenses in moods.items():
+            if not tenses:
+                raise ValueError(f"Empty mood {mood!r} in template {template!r}")
+            for tense, forms in tenses.items():
+                slot = slots.setdefault((mood, tense), len(slots))
+                vectors[slot] = b.vector(forms)
+        template_vectors.append(vectors)
+
+    for mood, tense in slots:
+        s["slot_mood"].append(b.string(mood))
+        s["slot_tense"].append(b.string(tense))
+    for vectors in template_vectors:
+        s["tpl_slots"].extend(vectors.get(slot, NONE) for slot in range(len(slots)))
+
+    # Infinitive entries: every verb in verbs-fr.json plus every template stem,
+    # each resolved once to the (template, prefix) used for conjugation.
+    entries = {}
+    for key in conjugations:
+        if ":" not in key:
+            continue
+        prefix, root = key.split(":")
+        entry = entries.setdefault(prefix + root, [NONE, NONE, key, prefix])
+        if entry[1] == NONE:
+            entry[1] = b.string(key)
+
+    for index, (verb, entry) in enumerate(verbs.items()):
+        template = entry["t"]
+        s["verb_name"].append(b.string(verb))
+        s["verb_tpl"].append(b.string(template))
+        s["verb_aux"].append(b.value(entry["aux"]) if "aux" in entry else NONE)
+        resolved = entries.setdefault(verb, [NONE, NONE, None, None])
+        resolved[0] = index
+        resolved[2] = template
+        resolved[3] = verb[:-len(template.split(":")[1])]
+
+    for name, (verb_index, group, template, prefix) in entries.items():
+        s["ent_name"].append(b.string(name))
+        s["ent_verb"].append(verb_index)
+        s["ent_group"].append(group)
+        s["ent_tpl"].append(b.string(template))
+        s["ent_plen"].append(len(prefix))
+
+    size = 1
+    while size < 2 * len(entries):
+        size *= 2
+    hash_slots = array("I", bytes(4 * size))
+    for index, name in enumerate(entries):
+        slot = zlib.crc32(name.encode("utf-8")) & (size - 1)
+        while hash_slots[slot]:
+            slot = (slot + 1) & (size - 1)
+        hash_slots[slot] = index + 1
+    s["hash_slots"] = hash_slots
+
+    blob = bytearray()
+    for text in b.strings:
+        s["str_off"].append(len(blob))
+        blob += text.encode("utf-8")
+    s["str_off"].append(len(blob))
+
+    payloads = [bytes(blob) if name == "str_blob" else s[name].tobytes() for name in SECTIONS]
+    spans = []
+    offset = HEADER.size
+    for payload in payloads:
+        offset += -offset % 8
+        spans += [offset, len(payload)]
+        offset += len(payload)
+
+    out = bytearray(offset)
+    HEADER.pack_into(out, 0, MAGIC, VERSION, digest, *spans)
+    for payload, start in zip(payloads, spans[::2]):
+        out[start:start + len(payload)] = payload
+    return bytes(out)
+
+
+# --- Reader ---
+class CompiledConjugations:
+    """Read-only view over a compiled cache held in any buffer (bytes, mmap, ...)"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        view = memoryview(buffer)
+        magic, version, self.digest, *spans = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a compiled conjugation cache")
+        for name, offset, size in zip(SECTIONS, spans[::2], spans[1::2]):
+            section = view[offset:offset + size]
+            setattr(self, "_" + name, section if name == "str_blob" else section.cast("I"))
+
+        self._slot_count = len(self._slot_mood)
+        # Decoded pieces shared by every template (and verb) that uses them
+        self._interned = {}  # string id -> str
+        self._vectors = {}   # vector id -> list of form dicts, or one dict
+        self._elements = {}  # (key, value) -> form dict
+        self._template_ids = {self.string(sid): i for i, sid in enumerate(self._tpl_name)}
+        self.verbs = VerbTable(self)
+        self.templates = TemplateTable(self)
+        self.infinitives = InfinitiveList(self)
+
+    def string(self, sid):
+        return str(self._str_blob[self._str_off[sid]:self._str_off[sid + 1]], "utf-8")
+
+    def interned(self, sid):
+        """Like string(), but every caller shares one str per id"""
+        text = self._interned.get(sid)
+        if text is None:
+            text = self._interned[sid] = sys.intern(self.string(sid))
+        return text
+
+    def value(self, value):
+        if value == NONE:
+            return None
+        if value & LIST_FLAG:
+            return [sys.intern(text) for text in self.string(value & ~LIST_FLAG).split(LIST_SEP)]
+        return self.interned(value)
+
+    def find(self, name):
+        """Return the infinitive entry index for name, or -1"""
+        key = name.encode("utf-8")
+        offsets, blob, names, slots = self._str_off, self._str_blob, self._ent_name, self._hash_slots
+        mask = len(slots) - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            entry = slots[slot]
+            if not entry:
+                return -1
+            sid = names[entry - 1]
+            if blob[offsets[sid]:offsets[sid + 1]] == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def resolve(self, verb):
+        """Return the (template, prefix) pair for verb, or None"""
+        entry = self.find(verb)
+        if entry < 0:
+            return None
+        return self.interned(self._ent_tpl[entry]), verb[:self._ent_plen[entry]]
+
+    def find_group(self, verb):
+        """Return the template whose stem spells out verb, or None"""
+        entry = self.find(verb)
+        if entry < 0 or self._ent_group[entry] == NONE:
+            return None
+        return self.interned(self._ent_group[entry])
+
+    def infinitive_templates(self):
+        """Return, for each infinitive in order, the index of its template in templates"""
+        index = {sid: i for i, sid in enumerate(self._tpl_name)}
+        return array("I", map(index.__getitem__, self._ent_tpl))
+
+    def decode_template(self, index):
+        template = {}
+        row = index * self._slot_count
+        for slot in range(self._slot_count):
+            vector = self._tpl_slots[row + slot]
+            if vector == NONE:
+                continue
+            mood = template.setdefault(self.interned(self._slot_mood[slot]), {})
+            mood[self.interned(self._slot_tense[slot])] = self._decode_vector(vector)
+        return template
+
+    def _decode_vector(self, vector):
+        """The forms of a vector; templates sharing it share one (read-only) list"""
+        forms = self._vectors.get(vector)
+        if forms is not None:
+            return forms
+        start = self._vec_start[vector]
+        info = self._vec_info[vector]
+        forms = [
+            self._decode_element(self._el_key[element], self._el_val[element])
+            for element in range(start, start + (info & 0xFFFF))
+        ]
+        forms = self._vectors[vector] = forms[0] if info & SCALAR_FLAG else forms
+        return forms
+
+    def _decode_element(self, key, value):
+        element = self._elements.get((key, value))
+        if element is None:
+            element = {} if key == NONE else {self.interned(key): self.value(value)}
+            self._elements[(key, value)] = element
+        return element
+
+
+class VerbTable(Mapping):
+    """verbs-fr.json as a mapping of verb -> {"t": template, "aux": auxiliary}"""
+
+    def __init__(self, compiled):
+        self._compiled = compiled
+
+    def _index(self, verb):
+        c = self._compiled
+        entry = c.find(verb) if isinstance(verb, str) else -1
+        return -1 if entry < 0 else c._ent_verb[entry]
+
+    def _entry(self, index):
+        c = self._compiled
+        entry = {"t": c.interned(c._verb_tpl[index])}
+        aux = c._verb_aux[index]
+        if aux != NONE:
+            entry["aux"] = c.value(aux)
+        return entry
+
+    def __getitem__(self, verb):
+        index = self._index(verb)
+        if index == NONE or index < 0:
+            raise KeyError(verb)
+        return self._entry(index)
+
+    def get(self, verb, default=None):
+        index = self._index(verb)
+        return default if index == NONE or index < 0 else self._entry(index)
+
+    def __contains__(self, verb):
+        index = self._index(verb)
+        return index != NONE and index >= 0
+
+    def __iter__(self):
+        c = self._compiled
+        for sid in c._verb_name:
+            yield c.string(sid)
+
+    def __len__(self):
+        return len(self._compiled._verb_name)
+
+
+class TemplateTable(Mapping):
+    """conjugation-fr.json as a mapping of template -> mood -> tense -> forms"""
+
+    def __init__(self, compiled):
+        self._compiled = compiled
+        self._decoded = {}
+
+    def __getitem__(self, template):
+        decoded = self._decoded.get(template)
+        if decoded is None:
+            index = self._compiled._template_ids[template]
+            decoded = self._decoded[template] = self._compiled.decode_template(index)
+        return decoded
+
+    def __contains__(self, template):
+        return template in self._compiled._template_ids
+
+    def __iter__(self):
+        return iter(self._compiled._template_ids)
+
+    def __len__(self):
+        return len(self._compiled._template_ids)
+
+
+class InfinitiveList(Sequence):
+    """Every conjugatable infinitive, decoded on access"""
+
+    def __init__(self, compiled):
+        self._compiled = compiled
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._compiled.string(self._compiled._ent_name[index])
+
+    def __contains__(self, verb):
+        return isinstance(verb, str) and self._compiled.find(verb) >= 0
+
+    def index(self, verb):
+        position = self._compiled.find(verb) if isinstance(verb, str) else -1
+        if position < 0:
+            raise ValueError(f"{verb!r} is not a known infinitive")
+        return position
+
+    def __len__(self):
+        return len(self._compiled._ent_name)
+
+
+# --- Loading ---
+def _open_cache(cache_path, digest):
+    try:
+        with open(cache_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < HEADER.size or HEADER.unpack_from(mapped)[:3] != (MAGIC, VERSION, digest):
+        mapped.close()
+        return None
+    return CompiledConjugations(mapped)
+
+
+def load(verbs_path="verbs-fr.json", conjugation_path="conjugation-fr.json",
+         cache_path="conjugation-fr.cache"):
+    """Map the compiled cache for the given sources, rebuilding it if stale"""
+    sources = []
+    for path in (verbs_path, conjugation_path):
+        with open(path, "rb") as f:
+            sources.append(f.read())
+    digest = source_digest(*sources)
+
+    compiled = _open_cache(cache_path, digest)
+    if compiled is not None:
+        return compiled
+
+    import json  # only needed when the cache is stale
+    data = compile_tables(json.loads(sources[0]), json.loads(sources[1]), digest)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # Read-only install or a cache file held open elsewhere: use it from memory
+        print(f"Could not write conjugation cache: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return CompiledConjugations(data)
+    return _open_cache(cache_path, digest) or CompiledConjugations(data)
+
+
+# --- Shared memory ---
+published = set()  # names of the blocks this process published
+attached = []      # blocks attach() has opened; the tables it returned point into them
+
+
+def publish(compiled=None, name=None):
+    """Copy compiled tables (default: load()) into a new shared memory block.
+
+    Worker processes attach() to block.name and read the tables in place. The
+    caller owns the block and should close() and unlink() it once the workers
+    are done.
+    """
+    from multiprocessing import shared_memory
+    compiled = compiled or load()
+    size = len(compiled.buffer)
+    block = shared_memory.SharedMemory(name=name, create=True, size=size)
+    block.buf[:size] = compiled.buffer
+    published.add(block.name)
+    return block
+
+
+def attach(name):
+    """Map the tables another process published under name, without copying"""
+    import multiprocessing
+    from multiprocessing import shared_memory
+
+    class AttachedBlock(shared_memory.SharedMemory):
+        def __del__(self):
+            pass  # close() fails while the tables point into the block; the OS unmaps it at exit
+
+    if sys.version_info >= (3, 13):
+        block = AttachedBlock(name=name, track=False)
+    else:
+        block = AttachedBlock(name=name)
+        # Opening registers the block with the resource tracker as if this
+        # process owned it. The publisher and its pool workers share one
+        # tracker, where the publisher's unlink() drops it; any other process
+        # has its own, which would unlink the block under everyone else when
+        # that process exits.
+        shared_tracker = name in published or multiprocessing.parent_process() is not None
+        if os.name != "nt" and not shared_tracker:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister("/" + block.name, "shared_memory")
+    attached.append(block)
+    return CompiledConjugations(block.buf)
+
+
+if __name__ == "__main__":
+    compiled = load()
+    print(f"Compiled {len(compiled.verbs)} verbs and {len(compiled.templates)} templates "
+          f"({len(compiled.buffer)} bytes)")
@@ -0,0 +1,225 @@
+"""Export every form the quiz can ask for to SQLite, CSV or JSON lines.
+
+    python export.py conjugations.sqlite
+    python export.py forms.csv --verbs top --workers 4
+
+Verbs are conjugated in chunks on a process pool and written out as each
+chunk arrives, in verb order, with a bounded number of chunks in flight.
+The workers read one copy of the conjugation tables from shared memory.
+The output is written aside and moved into place once complete. Verbs
+that can't be conjugated are reported and left out.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import batch
+import CouCou
+
+COLUMNS = ("verb", "template", "mood", "tense", "subject", "reflexive", "form")
+FORMATS = ("sqlite", "csv", "jsonl")
+EXTENSIONS = {"db": "sqlite", "sqlite": "sqlite", "sqlite3": "sqlite", "csv": "csv", "jsonl": "jsonl"}
+
+
+def conjugate_rows(verbs):
+    """Return (rows, failures) for verbs; rows follow COLUMNS"""
+    rows = []
+    failures = []
+    for verb in verbs:
+        try:
+            template, _ = CouCou.resolve_template(verb)
+            paradigm = list(CouCou.paradigm_rows(verb))
+        except Exception as e:
+            failures.append((verb, f"{type(e).__name__}: {e}"))
+            continue
+        for mood, tense, subject, form, reflexive_form in paradigm:
+            if form is not None:
+                rows.append((verb, template, mood, tense, subject, 0, form))
+            if reflexive_form is not None:
+                rows.append((verb, template, mood, tense, subject, 1, reflexive_form))
+    return rows, failures
+
+
+def attach_tables(name):
+    """Worker initializer: read the conjugation tables from the parent's shared memory"""
+    CouCou.data.shared_tables = name
+    CouCou.data.reload()
+
+
+def conjugate_chunk(verbs, fmt):
+    """Worker: conjugate verbs and encode the rows for fmt's writer"""
+    rows, failures = conjugate_rows(verbs)
+    return WRITERS[fmt].encode(rows), len(rows), failures
+
+
+# --- Writers ---
+# encode() runs in the workers, so text formats are rendered in parallel and
+# the writing process only has to copy strings to the file. close() finishes
+# a complete export; abort() just lets go of the file of a failed one.
+class SQLiteWriter:
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode = OFF")
+        self.db.execute("PRAGMA synchronous = OFF")
+        self.db.execute(f"CREATE TABLE forms ({', '.join(COLUMNS)})")
+        self.db.execute("CREATE TABLE failures (verb, error)")
+        self.insert = f"INSERT INTO forms VALUES ({', '.join('?' * len(COLUMNS))})"
+
+    @staticmethod
+    def encode(rows):
+        return rows
+
+    def write(self, rows):
+        self.db.executemany(self.insert, rows)
+
+    def fail(self, failures):
+        self.db.executemany("INSERT INTO failures VALUES (?, ?)", failures)
+
+    def close(self):
+        # Indexing once at the end is much faster than maintaining it per insert
+        try:
+            for column in ("verb", "template", "mood, tense", "form"):
+                name = column.replace(", ", "_")
+                self.db.execute(f"CREATE INDEX forms_{name} ON forms ({column})")
+            self.db.commit()
+        finally:
+            self.db.close()
+
+    def abort(self):
+        self.db.close()
+
+
+class CSVWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        csv.writer(self.file).writerow(COLUMNS)
+
+    @staticmethod
+    def encode(rows):
+        text = io.StringIO(newline="")
+        csv.writer(text).writerows(rows)
+        return text.getvalue()
+
+    def write(self, text):
+        self.file.write(text)
+
+    def fail(self, failures):
+        pass
+
+    def close(self):
+        self.file.close()
+
+    abort = close
+
+
+class JSONLWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    @staticmethod
+    def encode(rows):
+        return "".join(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n" for row in rows)
+
+    def write(self, text):
+        self.file.write(text)
+
+    def fail(self, failures):
+        pass
+
+    def close(self):
+        self.file.close()
+
+    abort = close
+
+
+WRITERS = {"sqlite": SQLiteWriter, "csv": CSVWriter, "jsonl": JSONLWriter}
+
+
+def guess_format(path):
+    return batch.guess_format(path, EXTENSIONS)
+
+
+# --- Export ---
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def conjugated_chunks(verbs, fmt, workers, chunk_size):
+    """Yield conjugate_chunk results in verb order, at most 2 * workers chunks ahead"""
+    chunks = chunked(verbs, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield conjugate_chunk(chunk, fmt)
+        return
+    import conjugation_cache
+    block = conjugation_cache.publish(CouCou.data.compiled_data)
+    try:
+        with ProcessPoolExecutor(workers, initializer=attach_tables, initargs=(block.name,)) as pool:
+            yield from batch.ordered_results(pool, conjugate_chunk, ((chunk, fmt) for chunk in chunks), 2 * workers)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def export(path, verbs, fmt=None, workers=None, chunk_size=64):
+    """Write every form of verbs to path; return (rows written, [(verb, error)])"""
+    fmt = fmt or guess_format(path)
+    workers = workers or os.cpu_count() or 1
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    writer = WRITERS[fmt](tmp_path)
+    written = 0
+    failures = []
+    complete = False
+    try:
+        try:
+            for payload, count, failed in conjugated_chunks(list(verbs), fmt, workers, chunk_size):
+                writer.write(payload)
+                writer.fail(failed)
+                written += count
+                failures.extend(failed)
+            complete = True
+        finally:
+            if complete:
+                writer.close()
+            else:
+                writer.abort()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return written, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="file to write (.sqlite/.db, .csv or .jsonl)")
+    parser.add_argument("--format", choices=FORMATS, help="output format (default: from the extension)")
+    parser.add_argument("--verbs", choices=("all", "top"), default="all",
+                        help="which verb list to export (default: all)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="verbs per work item (default: 64)")
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = args.format or guess_format(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+    verbs = CouCou.data.all_verbs if args.verbs == "all" else CouCou.data.top_verbs
+
+    start = time.perf_counter()
+    written, failures = export(args.output, verbs, fmt, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    for verb, error in failures:
+        print(f"Skipped {verb}: {error}")
+    print(f"Exported {written} forms of {len(verbs) - len(failures)} verbs to {args.output} "
+          f"in {elapsed:.1f}s ({len(failures)} skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Weighted random choice over a fixed set of items, with O(log n) updates.
+
+A Fenwick (binary indexed) tree over the item weights gives any prefix
+sum in O(log n), so both changing one item's weight and drawing an item
+in proportion to its weight (a descent through the tree) are O(log n),
+where rebuilding a cumulative list would be O(n) per change.
+"""
+import random
+from array import array
+
+
+class FenwickTree:
+    def __init__(self, weights):
+        size = len(weights)
+        self.weights = array("d", weights)
+        self.tree = array("d", bytes(8 * (size + 1)))  # 1-based
+        tree = self.tree
+        for i, weight in enumerate(self.weights, 1):
+            tree[i] += weight
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self.top = 1 << size.bit_length() >> 1 if size else 0  # highest power of two <= size
+
+    def __len__(self):
+        return len(self.weights)
+
+    def set(self, index, weight):
+        """Change the weight of item index"""
+        delta = weight - self.weights[index]
+        self.weights[index] = weight
+        tree, size = self.tree, len(self.weights)
+        i = index + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, count):
+        """Total weight of the first count items"""
+        total = 0.0
+        tree = self.tree
+        while count:
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    def total(self):
+        return self.prefix(len(self.weights))
+
+    def find(self, target):
+        """Return the item whose cumulative weight range holds target"""
+        tree, size = self.tree, len(self.weights)
+        position = 0
+        step = self.top
+        while step:
+            following = position + step
+            if following <= size and tree[following] <= target:
+                position = following
+                target -= tree[following]
+            step >>= 1
+        # Rounding in the running sums can walk past the last item with any weight
+        while position and (position >= size or not self.weights[position]):
+            position -= 1
+        return position
+
+    def sample(self, rng=random):
+        """Draw an item with probability proportional to its weight"""
+        return self.find(rng.random() * self.total())
@@ -0,0 +1,216 @@
+"""Grade a file of submitted answers against the forms the quiz expects.
+
+    python grade.py answers.csv graded.csv
+    python grade.py answers.jsonl graded.jsonl
+
+Each input row (a CSV row with a header, or a JSON object per line) names
+a verb, mood, tense, subject, whether it is reflexive, and the response
+given; a worksheet CSV with a response column added will do. Responses
+are compared the way the quiz compares them, ignoring case and
+surrounding spaces. Every input column is copied to the output, followed
+by the expected form, whether the response was correct, and why the row
+couldn't be graded if it couldn't.
+
+A row that can't be read or graded (too few columns, bad JSON, an unknown
+verb) gets the reason in its error column; blank lines are skipped.
+Rows are read, graded and written one at a time, so memory stays flat
+however long the file is. Each verb's template, auxiliary and participles
+are resolved the first time the verb comes up and kept for the rows that
+follow, so a row only costs picking its form out of the tables.
+"""
+import argparse
+import csv
+import json
+import operator
+import os
+import time
+from itertools import chain
+
+import batch
+import CouCou
+
+FORMATS = ("csv", "jsonl")
+INPUT_COLUMNS = ("verb", "mood", "tense", "subject", "reflexive", "response")
+RESULT_COLUMNS = ("expected", "correct", "error")
+FALSE = {"", "0", "false", "no", "non", "n", "f"}
+
+
+class Grader:
+    def __init__(self, cached_verbs=8192):
+        # verb -> resolve_verb(verb), or None for a verb that can't be conjugated
+        self.resolved = CouCou.LRUMemo(self.resolve, cached_verbs)
+        self.graded = self.correct = self.failed = 0
+
+    @staticmethod
+    def resolve(verb):
+        try:
+            return CouCou.resolve_verb(verb)
+        except Exception:
+            return None  # expected() lets expected_answer say why
+
+    def expected(self, verb, mood, tense, subject, is_reflexive):
+        """The quiz's answer; raises like expected_answer when there is none"""
+        resolved = self.resolved(verb)
+        answer = None
+        if resolved is not None:
+            try:
+                answer = CouCou.paradigm_form(resolved, mood, tense, subject)[is_reflexive]
+            except (KeyError, ValueError):
+                pass
+        if answer is None:
+            # A bad name or subject, or a reflexive imperative: let the engine decide
+            answer = CouCou.expected_answer(verb, mood, tense, subject, is_reflexive)
+        return answer
+
+    def grade(self, verb, mood, tense, subject, reflexive, response):
+        """Return (expected, correct, error) for one submitted answer, counting it"""
+        try:
+            is_reflexive = text(reflexive).lower() not in FALSE
+            expected = self.expected(text(verb), text(mood), text(tense), text(subject), is_reflexive)
+        except Exception as e:
+            return self.fail(f"{type(e).__name__}: {e}")
+        self.graded += 1
+        # The quiz's normalisation, from submit_or_next
+        correct = text(response).lower() == expected.lower()
+        self.correct += correct
+        return expected, int(correct), ""
+
+    def fail(self, error):
+        """Return the results for a row that can't be graded, counting it"""
+        self.graded += 1
+        self.failed += 1
+        return "", "", error
+
+
+def text(value):
+    """A field as stripped text; JSON lines may hold numbers, booleans or null"""
+    return "" if value is None else str(value).strip()
+
+
+# --- Reading and writing ---
+class Unreadable(list):
+    """An input line that isn't a row at all; error says why"""
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+
+def parse_object(line):
+    try:
+        row = json.loads(line)
+    except ValueError as e:
+        return Unreadable(f"unreadable JSON: {e}")
+    return row if isinstance(row, dict) else Unreadable("not a JSON object")
+
+
+def read_rows(f, fmt):
+    """Return (columns, rows): the input's column names and an iterator of value lists"""
+    if fmt == "csv":
+        rows = csv.reader(f)
+        return next(rows, list(INPUT_COLUMNS)), rows
+    objects = (parse_object(line) for line in f if line.strip())
+    unreadable = []  # before the first object, which names the columns
+    for first in objects:
+        if not isinstance(first, Unreadable):
+            break
+        unreadable.append(first)
+    else:
+        return list(INPUT_COLUMNS), iter(unreadable)
+    # Columns come from the first object; a field missing from a line reads as empty
+    columns = list(first) + [column for column in INPUT_COLUMNS if column not in first]
+    return columns, chain(unreadable, (
+        row if isinstance(row, Unreadable) else [row.get(column) for column in columns]
+        for row in chain((first,), objects)
+    ))
+
+
+def graded_rows(rows, columns, grader):
+    """Yield each row's kept columns followed by its results; bad rows are graded as errors"""
+    width = len(columns)
+    fields = operator.itemgetter(*map(columns.index, INPUT_COLUMNS))
+    kept = [i for i, column in enumerate(columns) if column not in RESULT_COLUMNS]
+    keep = operator.itemgetter(*kept) if len(kept) < width else None  # regrading a graded file
+    grade_row = grader.grade
+    for row in rows:
+        if isinstance(row, Unreadable):
+            results = grader.fail(row.error)
+            row = [""] * width
+        elif not row:
+            continue  # a blank CSV line
+        elif len(row) < width:
+            results = grader.fail(f"the row has {len(row)} of {width} columns")
+            row += [""] * (width - len(row))
+        else:
+            del row[width:]  # fields past the header have no column to go in
+            results = grade_row(*fields(row))
+        if keep:
+            row = list(keep(row))
+        row += results
+        yield row
+
+
+def guess_format(path):
+    return batch.guess_format(path, dict(zip(FORMATS, FORMATS)))
+
+
+def grade(path, output, in_fmt=None, out_fmt=None, grader=None):
+    """Grade every row of path into output; return the Grader with the totals.
+
+    Every input column is kept; JSON lines take their columns from the first line.
+    """
+    in_fmt = in_fmt or guess_format(path)
+    out_fmt = out_fmt or guess_format(output)
+    grader = grader or Grader()
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(path, encoding="utf-8-sig", newline="") as source:
+        columns, rows = read_rows(source, in_fmt)
+        missing = [column for column in INPUT_COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"{path} has no {', '.join(missing)} column")
+        rows = graded_rows(rows, columns, grader)
+        columns = [column for column in columns if column not in RESULT_COLUMNS] + list(RESULT_COLUMNS)
+
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                if out_fmt == "csv":
+                    writer = csv.writer(f)
+                    writer.writerow(columns)
+                    writer.writerows(rows)
+                else:
+                    for row in rows:
+                        f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+            os.replace(tmp_path, output)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return grader
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="answers to grade (.csv or .jsonl)")
+    parser.add_argument("output", help="graded file to write (.csv or .jsonl)")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default: from the extension)")
+    parser.add_argument("--output-format", choices=FORMATS,
+                        help="output format (default: from the extension)")
+    args = parser.parse_args(argv)
+
+    try:
+        in_fmt = args.format or guess_format(args.input)
+        out_fmt = args.output_format or guess_format(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    try:
+        grader = grade(args.input, args.output, in_fmt, out_fmt)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"Could not grade {args.input}: {e}\n")
+    elapsed = time.perf_counter() - start
+    print(f"Graded {grader.graded} answers into {args.output} in {elapsed:.2f}s: "
+          f"{grader.correct} correct, {grader.graded - grader.correct - grader.failed} wrong, "
+          f"{grader.failed} could not be graded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Opt-in latency histograms for the quiz's hot paths and a Tk lag watchdog.
+
+    COUCOU_PROFILE=profile.json python CouCou.py
+    python CouCou.py --profile
+
+Nothing here is imported unless profiling is turned on: the hot paths are
+wrapped in timers when it is, and left untouched otherwise. The watchdog
+asks Tk to call it back every interval and records how late each call
+comes, which is how long the event loop was busy with something else.
+Results are written as JSON on exit and whenever the dump key is pressed.
+"""
+import functools
+import json
+import math
+import os
+import time
+
+BUCKETS_PER_OCTAVE = 4
+
+
+class Histogram:
+    """Latencies in quarter-octave buckets, from 1 microsecond up"""
+    def __init__(self):
+        self.buckets = {}  # bucket -> count; bucket b holds up to 2 ** (b / 4) us
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        micros = seconds * 1e6
+        bucket = math.ceil(math.log2(micros) * BUCKETS_PER_OCTAVE) if micros > 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @staticmethod
+    def upper_bound(bucket):
+        return 2 ** (bucket / BUCKETS_PER_OCTAVE) / 1e6
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (within 19%)"""
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_s": self.total / self.count,
+            "p50_s": self.percentile(0.5),
+            "p90_s": self.percentile(0.9),
+            "p99_s": self.percentile(0.99),
+            "max_s": self.max,
+            "buckets": {f"{self.upper_bound(b):.6g}": n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class Instrumentation:
+    def __init__(self, path="coucou-profile.json"):
+        self.path = path
+        self.histograms = {}
+        self.started = time.perf_counter()
+        self.watchdog = None
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def wrap(self, owner, name):
+        """Replace owner.name (a class or module attribute) with a timed version"""
+        func = getattr(owner, name)
+        record = self.histogram(f"{owner.__name__}.{name}").record
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        setattr(owner, name, timed)
+        return func
+
+    # --- Event loop ---
+    def watch(self, root, interval=50):
+        """Record how late an after(interval) callback runs, for as long as root lives"""
+        record = self.histogram("event_loop_lag").record
+        clock = time.perf_counter
+
+        def tick(expected):
+            now = clock()
+            record(max(0.0, now - expected))
+            self.watchdog = root.after(interval, tick, clock() + interval / 1000)
+
+        self.watchdog = root.after(interval, tick, clock() + interval / 1000)
+
+    # --- Output ---
+    def results(self):
+        return {
+            "uptime_s": time.perf_counter() - self.started,
+            "histograms": {name: h.summary() for name, h in sorted(self.histograms.items())},
+        }
+
+    def dump(self, path=None):
+        """Write the results so far as JSON; return the path"""
+        path = path or self.path
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.results(), f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write profile to {path}: {e}")
+            return None
+        return path
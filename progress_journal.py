@@ -0,0 +1,231 @@
+"""Crash-safe persistence for achievement progress.
+
+Progress is a JSON snapshot (achievements.json) plus an append-only
+journal of the events recorded since that snapshot, one JSON array per
+line:
+
+    ["counter", "total", 42]
+    ["earned", "total", 40]
+    ["unlocked", "Monet-GIF/x.gif", "40 Total Correct"]
+
+Events are queued from the caller's thread and written by a background
+thread that coalesces counter updates within a batch. Every so often the
+writer folds the journal into a new snapshot, written aside and atomically
+swapped in, then truncates the journal. Replaying events is idempotent, so
+a crash between those two steps loses nothing. A line torn by a crash is
+cut off the journal on loading, before anything is appended after it.
+
+If the writer thread fails, recording and flushing raise JournalError
+instead of queueing events nobody will write.
+"""
+import json
+import os
+import queue
+import threading
+
+
+class JournalError(RuntimeError):
+    """The writer thread has stopped; nothing more can be recorded"""
+
+
+def empty_state():
+    return {"earned": set(), "counters": {}, "unlocked_images": []}
+
+
+def apply_events(state, events, unlocked=None):
+    """Apply events to state in order; unlocked is the set of unlocked paths"""
+    if unlocked is None:
+        unlocked = {image for image, _ in state["unlocked_images"]}
+    for event in events:
+        kind = event[0]
+        if kind == "counter":
+            state["counters"][event[1]] = event[2]
+        elif kind == "earned":
+            state["earned"].add((event[1], event[2]))
+        elif kind == "unlocked":
+            if event[1] not in unlocked:
+                unlocked.add(event[1])
+                state["unlocked_images"].append((event[1], event[2]))
+        else:
+            raise ValueError(f"Unknown progress event: {event!r}")
+    return state
+
+
+def coalesce(events):
+    """Keep only the last update of each counter, preserving the order of the rest"""
+    last = {event[1]: i for i, event in enumerate(events) if event[0] == "counter"}
+    return [
+        event for i, event in enumerate(events)
+        if event[0] != "counter" or last[event[1]] == i
+    ]
+
+
+class ProgressJournal:
+    def __init__(self, snapshot_path, journal_path, compact_every=500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+        self.queue = queue.Queue()
+        self.worker = None
+        self.error = None  # why the writer stopped, once it has failed
+        self.lock = threading.Lock()  # orders queueing against the writer failing
+
+    # --- Loading ---
+    def read_snapshot(self):
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return empty_state()
+        if not text.strip():
+            return empty_state()
+        try:
+            saved = json.loads(text)
+            return {
+                "earned": {tuple(x) for x in saved.get("earned", [])},
+                "counters": dict(saved.get("counters", {})),
+                "unlocked_images": [(img, desc) for img, desc in saved.get("unlocked_images", [])],
+            }
+        except (ValueError, TypeError, AttributeError) as e:
+            corrupt_path = self.snapshot_path + ".corrupt"
+            print(f"Could not read {self.snapshot_path} ({e}); keeping it as {corrupt_path}")
+            os.replace(self.snapshot_path, corrupt_path)
+            return empty_state()
+
+    def read_journal(self):
+        try:
+            with open(self.journal_path, "rb") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return []
+        usable = text.rfind(b"\n") + 1
+        if usable < len(text):
+            # A crash tore the last line; cut it off so the next event starts a line of its own
+            print(f"Dropping an incomplete last line of {self.journal_path}")
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(usable)
+        events = []
+        for number, line in enumerate(text[:usable].decode("utf-8", "replace").split("\n"), 1):
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                print(f"Skipping unreadable line {number} of {self.journal_path}")
+        return events
+
+    def load(self):
+        """Return the recovered state and start the background writer"""
+        state = self.read_snapshot()
+        apply_events(state, self.read_journal())
+
+        writer_state = {
+            "earned": set(state["earned"]),
+            "counters": dict(state["counters"]),
+            "unlocked_images": list(state["unlocked_images"]),
+        }
+        self.worker = threading.Thread(
+            target=self.run, args=(writer_state,), name="progress-writer", daemon=True
+        )
+        self.worker.start()
+        return state
+
+    # --- Recording (any thread) ---
+    def put(self, kind, payload):
+        with self.lock:
+            if self.error is not None:
+                raise JournalError(f"Progress writer stopped: {self.error}") from self.error
+            self.queue.put((kind, payload))
+
+    def record(self, *event):
+        self.put("event", list(event))
+
+    def compact(self):
+        """Ask the writer to fold the journal into a fresh snapshot"""
+        self.put("compact", None)
+
+    def flush(self, timeout=None):
+        """Block until everything recorded so far has been written.
+
+        Returns False on timeout; raises JournalError if the writer fails first.
+        """
+        done = threading.Event()
+        self.put("flush", done)
+        if not done.wait(timeout):
+            return False
+        if self.error is not None:
+            raise JournalError(f"Progress writer stopped: {self.error}") from self.error
+        return True
+
+    def close(self):
+        """Write everything out, compact, and stop the writer"""
+        if self.worker and self.worker.is_alive():
+            self.queue.put(("stop", None))
+            self.worker.join()
+
+    # --- Writer thread ---
+    def run(self, state):
+        unlocked = {image for image, _ in state["unlocked_images"]}
+        appended = 0
+        journal = None
+        batch = []
+        try:
+            journal = open(self.journal_path, "a", encoding="utf-8")
+            while True:
+                batch = [self.queue.get()]
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                events = coalesce([payload for kind, payload in batch if kind == "event"])
+                if events:
+                    journal.write("".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events))
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                    apply_events(state, events, unlocked)
+                    appended += len(events)
+
+                kinds = {kind for kind, _ in batch}
+                if appended >= self.compact_every or kinds & {"compact", "stop"}:
+                    journal.close()
+                    self.write_snapshot(state)
+                    journal = open(self.journal_path, "w", encoding="utf-8")
+                    appended = 0
+
+                for kind, payload in batch:
+                    if kind == "flush":
+                        payload.set()
+                if "stop" in kinds:
+                    return
+        except Exception as e:
+            print(f"Progress writer stopped: {e}")
+            with self.lock:
+                self.error = e
+            # Nothing will be written any more: release everyone waiting on a flush
+            while True:
+                try:
+                    kind, payload = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "flush":
+                    payload.set()
+            for kind, payload in batch:
+                if kind == "flush":
+                    payload.set()
+        finally:
+            if journal:
+                journal.close()
+
+    def write_snapshot(self, state):
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "earned": sorted(state["earned"]),
+                "counters": state["counters"],
+                "unlocked_images": state["unlocked_images"],
+            }, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
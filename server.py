@@ -0,0 +1,359 @@
+"""Serve the quiz to many students over HTTP/JSON, and load-test it.
+
+    python server.py serve --port 8000
+    python server.py load --sessions 200 --rounds 20
+
+Every session shares one copy of the conjugation data, one QuestionSpace per
+verb set and one achievement catalogue; a session itself only holds its
+score and achievement progress.
+
+Endpoints (all bodies are JSON):
+
+    POST   /sessions                 {"verb_set": "all" | "top"} -> {"session": id}
+    GET    /sessions/<id>            score, total, streak, unlocked achievements
+    GET    /sessions/<id>/question   the unanswered question, or a new one
+    POST   /sessions/<id>/answer     {"answer": "..."} -> correct, expected, feedback
+    DELETE /sessions/<id>
+"""
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import statistics
+import subprocess
+import sys
+import time
+
+import CouCou
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+MAX_BODY = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Sessions ---
+class Session:
+    __slots__ = ("id", "verb_set", "question", "score", "total", "streak", "progress", "last_seen")
+
+    def __init__(self, id, verb_set, progress):
+        self.id = id
+        self.verb_set = verb_set
+        self.question = None
+        self.score = 0
+        self.total = 0
+        self.streak = 0
+        self.progress = progress  # AchievementSystem kept in memory only
+        self.last_seen = time.monotonic()
+
+    def summary(self):
+        return {
+            "session": self.id,
+            "verb_set": self.verb_set,
+            "score": self.score,
+            "total": self.total,
+            "streak": self.streak,
+            "unlocked": [description for _, description in self.progress.unlocked_images],
+            "achievements": len(self.progress.earned_achievements),
+        }
+
+
+class QuizServer:
+    def __init__(self, idle_timeout=3600, seed=None):
+        self.idle_timeout = idle_timeout
+        self.rng = random.Random(seed)
+        self.sessions = {}
+        self.catalogue = CouCou.AchievementSystem(None)
+        self.spaces = {
+            "all": CouCou.QuestionSpace(CouCou.data.all_verbs),
+            "top": CouCou.QuestionSpace(CouCou.data.top_verbs),
+        }
+        CouCou.data.form_index  # wrong answers are explained from it; don't build it mid-request
+
+    # --- Endpoints ---
+    def create_session(self, body):
+        verb_set = body.get("verb_set", "all")
+        if not isinstance(verb_set, str) or verb_set not in self.spaces:
+            raise HTTPError(400, f"verb_set must be one of {', '.join(self.spaces)}")
+        session_id = secrets.token_urlsafe(9)
+        progress = CouCou.AchievementSystem(None, catalogue=self.catalogue)
+        self.sessions[session_id] = Session(session_id, verb_set, progress)
+        return 201, {"session": session_id}
+
+    def get_question(self, session):
+        if session.question is None:
+            session.question = self.spaces[session.verb_set].make_question(self.rng)
+        question = session.question
+        return 200, {
+            "verb": question.verb,
+            "mood": question.mood,
+            "tense": question.tense,
+            "subject": question.subject,
+            "is_reflexive": question.is_reflexive,
+            "prompt": CouCou.question_prompt(question.verb, question.mood, question.tense,
+                                             question.subject, question.is_reflexive),
+        }
+
+    def answer(self, session, body):
+        question = session.question
+        if question is None:
+            raise HTTPError(409, "no question to answer; GET the question first")
+        answer = body.get("answer")
+        if not isinstance(answer, str) or not answer.strip():
+            raise HTTPError(400, "answer must be a non-empty string")
+
+        user_input = answer.strip().lower()
+        session.question = None
+        session.total += 1
+        result = {"correct": user_input == question.answer.lower(), "expected": question.answer}
+        if result["correct"]:
+            session.score += 1
+            session.streak += 1
+            session.progress.update_counters(session.streak, session.score, question.mood, question.tense)
+            result["achievements"] = [
+                {"description": achievement["description"], "category": achievement["category"]}
+                for achievement in session.progress.check_achievements()
+            ]
+        else:
+            session.streak = 0
+            result["explanation"] = CouCou.explain_answer(question, user_input)
+        result.update(score=session.score, total=session.total, streak=session.streak)
+        return 200, result
+
+    def dispatch(self, method, path, body):
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if parts == ["sessions"]:
+            if method != "POST":
+                raise HTTPError(405, "use POST to create a session")
+            return self.create_session(body)
+        if len(parts) not in (2, 3) or parts[0] != "sessions":
+            raise HTTPError(404, f"no such endpoint: {path}")
+
+        session = self.sessions.get(parts[1])
+        if session is None:
+            raise HTTPError(404, "no such session")
+        session.last_seen = time.monotonic()
+        action = parts[2] if len(parts) == 3 else None
+        if (method, action) == ("GET", None):
+            return 200, session.summary()
+        if (method, action) == ("DELETE", None):
+            del self.sessions[session.id]
+            return 200, {}
+        if (method, action) == ("GET", "question"):
+            return self.get_question(session)
+        if (method, action) == ("POST", "answer"):
+            return self.answer(session, body)
+        raise HTTPError(405 if action in (None, "question", "answer") else 404,
+                        f"{method} {path} is not supported")
+
+    # --- HTTP ---
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line.strip():
+                        break
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if not line.strip():
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # A line longer than the stream's limit; where the request ends is lost
+                    await self.respond(writer, 431, {"error": "request line or header too long"}, False)
+                    break
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length") or 0)
+                    if length > MAX_BODY:
+                        raise HTTPError(413, f"request bodies are limited to {MAX_BODY} bytes")
+                    raw = await reader.readexactly(length) if length else b""
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "the request body must be a JSON object")
+                    status, payload = self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    keep_alive = keep_alive and status != 413  # the body was not read
+                except ValueError as e:
+                    status, payload = 400, {"error": f"malformed request: {e}"}
+                    keep_alive = False
+                except Exception as e:
+                    # A bug, not the client's fault; answer rather than drop the connection
+                    print(f"Error handling {request_line!r}: {type(e).__name__}: {e}")
+                    status, payload = 500, {"error": "internal error"}
+                    keep_alive = False
+
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+        )
+        await writer.drain()
+
+    async def expire_sessions(self):
+        while True:
+            await asyncio.sleep(min(60, self.idle_timeout))
+            cutoff = time.monotonic() - self.idle_timeout
+            for session_id in [s.id for s in self.sessions.values() if s.last_seen < cutoff]:
+                del self.sessions[session_id]
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving on http://{host}:{port}", flush=True)
+        expiry = asyncio.ensure_future(self.expire_sessions())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+
+
+# --- Load generator ---
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: quiz\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def student(host, port, rounds, accuracy, rng, latencies):
+    """One simulated student: a session, then rounds of question + answer"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, created = await request(reader, writer, "POST", "/sessions",
+                                   {"verb_set": rng.choice(("all", "top"))})
+        base = f"/sessions/{created['session']}"
+        for _ in range(rounds):
+            start = time.perf_counter()
+            status, question = await request(reader, writer, "GET", f"{base}/question")
+            latencies["question"].append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"GET question failed with {status}: {question}")
+
+            answer = "je ne sais pas"
+            if rng.random() < accuracy:
+                answer = CouCou.expected_answer(question["verb"], question["mood"], question["tense"],
+                                                question["subject"], question["is_reflexive"])
+            start = time.perf_counter()
+            status, result = await request(reader, writer, "POST", f"{base}/answer", {"answer": answer})
+            latencies["answer"].append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"POST answer failed with {status}: {result}")
+    finally:
+        writer.close()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_load(host, port, sessions, rounds, accuracy=0.7, seed=1):
+    """Run sessions concurrent students; return latency percentiles and throughput"""
+    rng = random.Random(seed)
+    latencies = {"question": [], "answer": []}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        student(host, port, rounds, accuracy, random.Random(rng.random()), latencies)
+        for _ in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    results = {"sessions": sessions, "rounds": rounds, "elapsed_s": elapsed,
+               "requests_per_second": sum(map(len, latencies.values())) / elapsed}
+    for endpoint, values in latencies.items():
+        results[f"{endpoint}_p50_s"] = statistics.median(values)
+        results[f"{endpoint}_p99_s"] = percentile(values, 0.99)
+    return results
+
+
+def start_local_server():
+    """Start `server.py serve` on a free port; return (process, host, port)"""
+    process = subprocess.Popen([sys.executable, __file__, "serve", "--port", "0"],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving on http://"):
+        process.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    host, port = line.strip().rsplit("/", 1)[1].rsplit(":", 1)
+    return process, host, int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the quiz server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--idle-timeout", type=int, default=3600,
+                       help="seconds before an idle session is dropped (default: 3600)")
+    load = commands.add_parser("load", help="load-test a server (starts a local one by default)")
+    load.add_argument("--connect", metavar="HOST:PORT", help="server to test instead of a local one")
+    load.add_argument("--sessions", type=int, default=100, help="concurrent students (default: 100)")
+    load.add_argument("--rounds", type=int, default=20, help="questions per student (default: 20)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(QuizServer(args.idle_timeout).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    process = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+    else:
+        process, host, port = start_local_server()
+    try:
+        results = asyncio.run(run_load(host, int(port), args.sessions, args.rounds))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+    for key, value in results.items():
+        if key.endswith("_s") and key != "elapsed_s":
+            print(f"{key[:-2]}: {value * 1000:.2f} ms")
+        else:
+            print(f"{key}: {value:.1f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,19 @@ setup(
                 "random",
                 "os",
                 "pathlib",
+                "mmap",
+                "hashlib",
+                "zlib",
+                "conjugation_cache",
+                "spaced_repetition",
+                "progress_journal",
+                "thumbnail_cache",
+                "instrumentation",
+                "answer_history",
+                "fenwick",
+                "worksheet",
+                "grade",
+                "batch",
                 "tkinter.messagebox",
                 "tkinter.ttk"
             ],
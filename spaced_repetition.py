@@ -0,0 +1,175 @@
+"""Leitner spaced-repetition scheduling over a fixed space of integer items.
+
+All per-item state lives in flat arrays sized to the item space, and the
+due items are kept in an array-backed binary heap with a position index,
+so memory does not grow with the number of items seen and picking or
+rescheduling an item is O(log n).
+
+Time is counted in answers, not wall-clock time. Every answer appends one
+fixed-size record to the state file; the file is compacted into a fresh
+snapshot (written aside and atomically swapped in) once it holds mostly
+superseded records.
+"""
+import os
+import struct
+from array import array
+
+# Answers to wait before the next review, by box. Box 0 means never seen.
+INTERVALS = (0, 2, 6, 20, 60, 200, 600, 2000)
+
+MAGIC = b"CCLS"
+HEADER = struct.Struct("<4sI32s")  # magic, item count, data digest
+RECORD = struct.Struct("<IIIB")    # item, due, clock, box
+
+
+class LeitnerScheduler:
+    def __init__(self, size, path=None, digest=b"\0" * 32):
+        self.size = size
+        self.path = path
+        self.digest = digest
+        self.clock = 0
+        self.box = array("B", bytes(size))
+        self.due = array("I", bytes(4 * size))
+        self.heap = array("I")                  # seen items, ordered by due
+        self.slot = array("I", bytes(4 * size))  # heap index + 1, 0 when not scheduled
+        self.records = 0
+        self.log = None
+        if path:
+            self.load()
+
+    # --- Heap ---
+    def _sift_up(self, i):
+        heap, due, slot = self.heap, self.due, self.slot
+        item = heap[i]
+        key = due[item]
+        while i:
+            parent = (i - 1) >> 1
+            other = heap[parent]
+            if due[other] <= key:
+                break
+            heap[i] = other
+            slot[other] = i + 1
+            i = parent
+        heap[i] = item
+        slot[item] = i + 1
+
+    def _sift_down(self, i):
+        heap, due, slot = self.heap, self.due, self.slot
+        size = len(heap)
+        item = heap[i]
+        key = due[item]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and due[heap[child + 1]] < due[heap[child]]:
+                child += 1
+            other = heap[child]
+            if key <= due[other]:
+                break
+            heap[i] = other
+            slot[other] = i + 1
+            i = child
+        heap[i] = item
+        slot[item] = i + 1
+
+    def schedule(self, item, due):
+        self.due[item] = due
+        index = self.slot[item] - 1
+        if index < 0:
+            self.heap.append(item)
+            self._sift_up(len(self.heap) - 1)
+        else:
+            self._sift_up(index)
+            self._sift_down(self.slot[item] - 1)
+
+    def discard(self, item):
+        """Stop scheduling item (e.g. when it can no longer be asked)"""
+        index = self.slot[item] - 1
+        if index < 0:
+            return
+        self.slot[item] = 0
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self._sift_up(index)
+            self._sift_down(self.slot[last] - 1)
+
+    # --- Scheduling ---
+    def next_due(self):
+        """Return the most overdue item if one is due now, else None"""
+        if self.heap and self.due[self.heap[0]] <= self.clock:
+            return self.heap[0]
+        return None
+
+    def seen(self, item):
+        return self.box[item] > 0
+
+    def record(self, item, correct):
+        """Move item up a box when answered correctly, back to box 1 otherwise"""
+        self.clock += 1
+        box = min(self.box[item] + 1, len(INTERVALS) - 1) if correct else 1
+        self.box[item] = box
+        self.schedule(item, self.clock + INTERVALS[box])
+        if self.path:
+            self.append(item)
+
+    # --- Persistence ---
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(HEADER.size)
+                body = f.read()
+        except FileNotFoundError:
+            header = body = b""
+
+        if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, self.size, self.digest):
+            if header:
+                print(f"Ignoring review state in {self.path}: it was saved for other verb data")
+            self.compact()
+            return
+
+        usable = len(body) - len(body) % RECORD.size  # a crash can leave a torn last record
+        for item, due, clock, box in RECORD.iter_unpack(memoryview(body)[:usable]):
+            if item < self.size:
+                self.box[item] = box
+                self.due[item] = due
+                self.clock = max(self.clock, clock)
+        self.records = usable // RECORD.size
+
+        self.heap = array("I", (item for item in range(self.size) if self.box[item]))
+        for index, item in enumerate(self.heap):
+            self.slot[item] = index + 1
+        for index in reversed(range(len(self.heap) // 2)):
+            self._sift_down(index)
+        self.open_log()
+        if usable != len(body):
+            self.compact()
+
+    def open_log(self):
+        self.log = open(self.path, "ab")
+
+    def append(self, item):
+        self.log.write(RECORD.pack(item, self.due[item], self.clock, self.box[item]))
+        self.log.flush()
+        self.records += 1
+        if self.records > 2 * len(self.heap) + 1024:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the state file with one record per seen item"""
+        if self.log:
+            self.log.close()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.size, self.digest))
+            for item in self.heap:
+                f.write(RECORD.pack(item, self.due[item], self.clock, self.box[item]))
+        os.replace(tmp_path, self.path)
+        self.records = len(self.heap)
+        self.open_log()
+
+    def close(self):
+        if self.log:
+            self.log.close()
+            self.log = None
@@ -0,0 +1,104 @@
+"""Pre-scaled achievement thumbnails, cached on disk and in memory.
+
+A thumbnail is stored as a small GIF in the cache directory, named after
+a hash of the source path, modification time, size and thumbnail size,
+so editing or replacing a painting produces a new entry. Recently shown
+thumbnails also stay decoded in an in-memory LRU.
+
+Missing thumbnails are made by an idle-time worker on the Tk thread, one
+per idle callback, newest request first. Tk images cannot be created
+from another thread.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+
+
+def scale_to_fit(image, size):
+    """Subsample a PhotoImage so it fits in a size x size square"""
+    factor = max(1, -(-max(image.width(), image.height()) // size))
+    return image.subsample(factor, factor)
+
+
+class ThumbnailCache:
+    def __init__(self, root, size, directory="thumbnails", capacity=200):
+        self.root = root
+        self.size = size
+        self.directory = directory
+        self.capacity = capacity
+        self.images = OrderedDict()   # source path -> PhotoImage, least recent first
+        self.pending = OrderedDict()  # source path -> callbacks waiting for it
+        self.job = None
+        self.hits = self.disk_hits = self.generated = 0
+
+    def cache_path(self, path):
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.size}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".gif")
+
+    def remember(self, path, image):
+        self.images[path] = image
+        self.images.move_to_end(path)
+        while len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+
+    def get(self, path):
+        """Return the thumbnail if it is in memory or on disk, else None"""
+        image = self.images.get(path)
+        if image is not None:
+            self.images.move_to_end(path)
+            self.hits += 1
+            return image
+        import tkinter as tk
+        try:
+            image = tk.PhotoImage(file=self.cache_path(path))
+        except (OSError, tk.TclError):
+            return None
+        self.disk_hits += 1
+        self.remember(path, image)
+        return image
+
+    def generate(self, path):
+        """Decode the full-size image, scale it down and store the result"""
+        import tkinter as tk
+        image = scale_to_fit(tk.PhotoImage(file=path), self.size)
+        cache_path = self.cache_path(path)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            image.write(tmp_path, format="gif")
+            os.replace(tmp_path, cache_path)
+        except (OSError, tk.TclError) as e:
+            print(f"Could not cache thumbnail for {path}: {e}")
+        self.generated += 1
+        self.remember(path, image)
+        return image
+
+    def request(self, path, callback):
+        """Call callback(image) once the thumbnail exists, or callback(None) if it can't be made"""
+        self.pending.setdefault(path, []).append(callback)
+        self.pending.move_to_end(path)
+        if self.job is None:
+            self.job = self.root.after_idle(self.work)
+
+    def work(self):
+        self.job = None
+        if not self.pending:
+            return
+        path, callbacks = self.pending.popitem()
+        try:
+            image = self.generate(path)
+        except Exception as e:
+            print(f"Error loading image {path}: {e}")
+            image = None
+        for callback in callbacks:
+            callback(image)
+        if self.pending:
+            self.job = self.root.after_idle(self.work)
+
+    def cancel(self):
+        """Drop every outstanding request (e.g. when the gallery closes)"""
+        self.pending.clear()
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
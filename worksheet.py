@@ -0,0 +1,201 @@
+"""Generate practice sheets and answer keys without the quiz window.
+
+    python worksheet.py sheet.txt --count 40 --seed 7 --key answers.txt
+    python worksheet.py questions.csv --count 1000000 --verbs top --workers 4
+
+Questions are drawn the way the quiz draws them (QuestionSpace with the
+verb set's question weights) and answered from each verb's resolved
+template, auxiliary and participles, worked out once per verb.
+A sheet is cut into blocks of BLOCK questions, each drawn from its own
+generator seeded with (seed, block number), so the same seed always gives
+the same sheet however many worker processes produce the blocks.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import batch
+import CouCou
+
+BLOCK = 50_000
+FORMATS = ("text", "csv", "jsonl")
+EXTENSIONS = {"txt": "text", "text": "text", "csv": "csv", "jsonl": "jsonl"}
+COLUMNS = ("number", "verb", "mood", "tense", "subject", "reflexive", "prompt", "answer")
+VERB_SETS = {"all": "all_verbs", "top": "top_verbs"}
+needs_quotes = re.compile('[,"\r\n]').search
+
+
+class Worksheet:
+    def __init__(self, verb_set="all"):
+        name = VERB_SETS[verb_set]
+        verbs = getattr(CouCou.data, name)
+        self.space = CouCou.QuestionSpace(list(verbs), CouCou.question_weights[name])
+        self.resolved = {}  # verb -> CouCou.resolve_verb(verb)
+        self.forms = {}  # (verb, mood, tense, subject) -> (form, reflexive_form)
+        self.prompts = {}  # (mood, tense, is_reflexive) -> prompt text around the verb and subject
+
+    def form(self, verb, mood, tense, subject):
+        resolved = self.resolved.get(verb)
+        if resolved is None:
+            resolved = self.resolved[verb] = CouCou.resolve_verb(verb)
+        forms = self.forms[verb, mood, tense, subject] = CouCou.paradigm_form(resolved, mood, tense, subject)
+        return forms
+
+    def questions(self, count, rng):
+        """Yield count (verb, mood, tense, subject, is_reflexive, answer) tuples"""
+        # Only the forms asked for are worked out: a sheet over every verb asks
+        # few questions of each, so whole paradigms would mostly go unused
+        forms = self.forms
+        for verb, mood, tense, subject, is_reflexive in self.space.draws(count, rng):
+            pair = forms.get((verb, mood, tense, subject)) or self.form(verb, mood, tense, subject)
+            yield verb, mood, tense, subject, is_reflexive, pair[is_reflexive]
+
+    def prompt_parts(self, mood, tense, is_reflexive):
+        """Cut question_prompt's text for (mood, tense) around the verb and the subject"""
+        head, rest = CouCou.question_prompt("\0", mood, tense, "\1", is_reflexive).split("\0")
+        parts = self.prompts[mood, tense, is_reflexive] = (head, *rest.split("\1"))
+        return parts
+
+    def block(self, seed, block, count, fmt):
+        """Render questions block * BLOCK + 1 onwards; return (sheet text, answer key text)"""
+        rng = random.Random(f"{seed}/{block}")
+        self.space.recent.clear()
+        prompts, prompt_parts = self.prompts, self.prompt_parts
+        questions = enumerate(self.questions(count, rng), block * BLOCK + 1)
+
+        if fmt == "text":
+            sheet = []
+            key = []
+            for number, (verb, mood, tense, subject, is_reflexive, answer) in questions:
+                head, middle, tail = prompts.get((mood, tense, is_reflexive)) or prompt_parts(mood, tense, is_reflexive)
+                sheet.append(f"{number}. {head}{verb}{middle}{subject}{tail}\n")
+                key.append(f"{number}. {answer}\n")
+            return "".join(sheet), "".join(key)
+
+        rows = []
+        for number, (verb, mood, tense, subject, is_reflexive, answer) in questions:
+            head, middle, tail = prompts.get((mood, tense, is_reflexive)) or prompt_parts(mood, tense, is_reflexive)
+            rows.append((number, verb, mood, tense, subject, int(is_reflexive),
+                         head + verb + middle + subject + tail, answer))
+        if fmt == "csv":
+            # Written as csv.writer would: only the prompt, which has a comma, needs quoting.
+            # Rows with anything unusual go through csv.writer itself.
+            lines = []
+            writerow = csv.writer(SimpleNamespace(write=lines.append)).writerow
+            for row in rows:
+                number, verb, mood, tense, subject, reflexive, prompt, answer = row
+                if "," in prompt and '"' not in prompt and not needs_quotes(f"{verb}{mood}{tense}{subject}{answer}"):
+                    lines.append(f'{number},{verb},{mood},{tense},{subject},{reflexive},"{prompt}",{answer}\r\n')
+                else:
+                    writerow(row)
+            return "".join(lines), ""
+        # What json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) writes, without building the dicts
+        encode = json.encoder.encode_basestring
+        return "".join([
+            f'{{"number": {number}, "verb": {encode(verb)}, "mood": {encode(mood)}, '
+            f'"tense": {encode(tense)}, "subject": {encode(subject)}, "reflexive": {reflexive}, '
+            f'"prompt": {encode(prompt)}, "answer": {encode(answer)}}}\n'
+            for number, verb, mood, tense, subject, reflexive, prompt, answer in rows
+        ]), ""
+
+
+# --- Workers ---
+worker_sheet = None
+
+
+def start_worker(tables, verb_set):
+    """Pool initializer: attach to the parent's conjugation tables and build the question space"""
+    global worker_sheet
+    CouCou.data.shared_tables = tables
+    CouCou.data.reload()
+    worker_sheet = Worksheet(verb_set)
+
+
+def render_block(seed, block, count, fmt):
+    return worker_sheet.block(seed, block, count, fmt)
+
+
+def rendered_blocks(count, fmt, seed, verb_set, workers):
+    """Yield (sheet, key) text for each block in order, at most 2 * workers blocks ahead"""
+    blocks = ((block, min(BLOCK, count - block * BLOCK)) for block in range(-(-count // BLOCK)))
+    workers = min(workers, os.cpu_count() or 1)  # more processes than CPUs only add overhead
+    if workers == 1:
+        sheet = Worksheet(verb_set)
+        for block, size in blocks:
+            yield sheet.block(seed, block, size, fmt)
+        return
+    import conjugation_cache
+    tables = conjugation_cache.publish(CouCou.data.compiled_data)
+    try:
+        with ProcessPoolExecutor(workers, initializer=start_worker, initargs=(tables.name, verb_set)) as pool:
+            items = ((seed, block, size, fmt) for block, size in blocks)
+            yield from batch.ordered_results(pool, render_block, items, 2 * workers)
+    finally:
+        tables.close()
+        tables.unlink()
+
+
+def guess_format(path):
+    return batch.guess_format(path, EXTENSIONS)
+
+
+def generate(path, count, fmt=None, seed=0, verb_set="all", workers=1, key_path=None):
+    """Write count questions to path (and text answers to key_path); return the count"""
+    fmt = fmt or guess_format(path)
+    outputs = [(path, f"{path}.{os.getpid()}.tmp")]
+    if fmt == "text" and key_path:
+        outputs.append((key_path, f"{key_path}.{os.getpid()}.tmp"))
+    files = [open(tmp_path, "w", encoding="utf-8", newline="") for _, tmp_path in outputs]
+    try:
+        if fmt == "csv":
+            csv.writer(files[0]).writerow(COLUMNS)
+        for texts in rendered_blocks(count, fmt, seed, verb_set, workers):
+            for f, text in zip(files, texts):
+                f.write(text)
+        for f in files:
+            f.close()
+        for final_path, tmp_path in outputs:
+            os.replace(tmp_path, final_path)
+    except BaseException:
+        for f, (_, tmp_path) in zip(files, outputs):
+            f.close()
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="file to write (.txt, .csv or .jsonl)")
+    parser.add_argument("--format", choices=FORMATS, help="output format (default: from the extension)")
+    parser.add_argument("--count", type=int, default=40, help="number of questions (default: 40)")
+    parser.add_argument("--seed", default="0", help="seed; the same seed gives the same sheet (default: 0)")
+    parser.add_argument("--verbs", choices=VERB_SETS, default="all", help="verb set (default: all)")
+    parser.add_argument("--key", help="answer key file for the text format")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"worker processes, each drawing blocks of {BLOCK} questions; "
+                             f"at most one per CPU (default: 1)")
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = args.format or guess_format(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.key and fmt != "text":
+        parser.error("--key only applies to the text format; CSV and JSONL include the answers")
+
+    start = time.perf_counter()
+    count = generate(args.output, args.count, fmt, args.seed, args.verbs, args.workers, args.key)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {count} questions to {args.output} in {elapsed:.1f}s "
+          f"({count / elapsed:,.0f} questions/s)")
+
+
+if __name__ == "__main__":
+    main()